@@ -0,0 +1,43 @@
+"""
+Compare message_to_dict with MessageToDict on typical streaming recognition response.
+Usage: python benchmarks/message_to_dict.py
+"""
+import timeit
+
+from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.stt.v1 import stt_pb2
+from tinkoff_voicekit_client.speech_utils.proto_converter import message_to_dict, proto_message_to_dict
+
+NUMBER = 2000
+
+
+def create_response(words_count: int = 20):
+    response = stt_pb2.StreamingRecognizeResponse()
+    result = response.results.add()
+    result.is_final = True
+    result.recognition_result.start_time.FromMilliseconds(0)
+    result.recognition_result.end_time.FromMilliseconds(words_count * 300)
+    alternative = result.recognition_result.alternatives.add()
+    alternative.transcript = " ".join(["слово"] * words_count)
+    alternative.confidence = 0.9
+    for index in range(words_count):
+        word = alternative.words.add()
+        word.word = "слово"
+        word.confidence = 0.9
+        word.start_time.FromMilliseconds(index * 300)
+        word.end_time.FromMilliseconds(index * 300 + 250)
+    return response
+
+
+def main():
+    response = create_response()
+    assert message_to_dict(response) == proto_message_to_dict(response)
+
+    generic_time = timeit.timeit(lambda: proto_message_to_dict(response), number=NUMBER)
+    fast_time = timeit.timeit(lambda: message_to_dict(response), number=NUMBER)
+    print(f"MessageToDict:   {generic_time / NUMBER * 10**6:.1f} us per response")
+    print(f"message_to_dict: {fast_time / NUMBER * 10**6:.1f} us per response")
+    print(f"speedup: {generic_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Compare accumulation of synthesized LINEAR16 audio in bytearray with previous list of ints.
+Usage: python benchmarks/tts_audio.py
+"""
+import timeit
+
+from tinkoff_voicekit_client.TTS.helper_tts import get_encoder
+
+RATE = 48000
+CHUNK_SIZE = 4800 * 2
+DURATION_SECONDS = 60
+NUMBER = 3
+
+
+def create_chunks():
+    return [bytes(CHUNK_SIZE)] * (RATE * 2 * DURATION_SECONDS // CHUNK_SIZE)
+
+
+def accumulate_list(chunks):
+    audio_chunks = []
+    for chunk in chunks:
+        audio_chunks += list(map(lambda x: int(x), chunk))
+    return bytes(audio_chunks)
+
+
+def accumulate_bytearray(chunks):
+    get_chunk = get_encoder("LINEAR16", RATE)
+    audio = bytearray()
+    for chunk in chunks:
+        audio += get_chunk(chunk)
+    return audio
+
+
+def main():
+    chunks = create_chunks()
+    assert accumulate_list(chunks) == accumulate_bytearray(chunks)
+    for function in (accumulate_list, accumulate_bytearray):
+        elapsed = timeit.timeit(lambda: function(chunks), number=NUMBER) / NUMBER
+        print(f"{function.__name__}: {elapsed * 1000:.1f} ms per minute of {RATE} Hz audio")
+
+
+if __name__ == "__main__":
+    main()
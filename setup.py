@@ -28,4 +28,8 @@ setuptools.setup(
     ],
     include_package_data=True,
     install_requires=requirements,
+    extras_require={
+        "prometheus": ["prometheus_client>=0.8.0"],
+        "numpy": ["numpy"],
+    },
 )
@@ -1,5 +1,7 @@
 import os
+from concurrent import futures
 
+import grpc
 import pytest
 
 from tinkoff_voicekit_client import ClientSTT, ClientTTS, ClientOperations, aio_voicekit
@@ -19,6 +21,32 @@ def params():
     return ClientParams()
 
 
+@pytest.fixture
+def grpc_server():
+    """
+    Factory of local grpc servers stopped at the end of test:
+    grpc_server(service, handlers, max_workers=4, credentials=None) returns client params of started server,
+    handlers are dict of method name to rpc method handler, server is secure if credentials are given.
+    """
+    servers = []
+
+    def start(service=None, handlers=None, max_workers=4, credentials=None):
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        if handlers:
+            server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(service, handlers),))
+        if credentials is None:
+            port = server.add_insecure_port("localhost:0")
+        else:
+            port = server.add_secure_port("localhost:0", credentials)
+        server.start()
+        servers.append(server)
+        return {"host": "localhost", "port": port, "ssl_channel": credentials is not None}
+
+    yield start
+    for server in servers:
+        server.stop(None)
+
+
 @pytest.fixture
 def client_stt(params):
     return ClientSTT(params.API_KEY, params.SECRET_KEY)
@@ -0,0 +1,219 @@
+import asyncio
+import gc
+import time
+
+import grpc
+import pytest
+
+from tinkoff_voicekit_client import ChannelOptions, ClientSTT, ClientTTS, ClientOperations, aio_voicekit
+from tinkoff_voicekit_client.speech_utils.BaseClient import aio_client, base_client
+from tinkoff_voicekit_client.speech_utils.BaseClient.balanced_stub import BalancedStub
+from tinkoff_voicekit_client.speech_utils.BaseClient.channel_pool import ChannelPool
+from tinkoff_voicekit_client.speech_utils.config_data import MAX_LENGTH
+
+
+@pytest.fixture
+def local_params():
+    return {"host": "localhost", "port": 50051, "ssl_channel": False}
+
+
+@pytest.fixture
+def local_server(grpc_server):
+    return grpc_server()
+
+
+def test_shared_channel(local_params):
+    client_stt = ClientSTT("api_key", "c2VjcmV0", **local_params)
+    client_tts = ClientTTS("api_key", "c2VjcmV0", **local_params)
+    client_operations = ClientOperations("api_key", "c2VjcmV0", **local_params)
+    assert client_stt._channel is client_tts._channel is client_operations._channel
+
+    own_client = ClientTTS("api_key", "c2VjcmV0", shared_channel=False, **local_params)
+    assert own_client._channel is not client_stt._channel
+
+
+def test_multiple_channels(local_params):
+    client = ClientSTT("api_key", "c2VjcmV0", channels_count=3, **local_params)
+    assert len(set(map(id, client._channels))) == 3
+    assert isinstance(client._stub, BalancedStub)
+    client.close()
+    assert client._channels == []
+
+
+def test_channel_options(local_params):
+    options = ChannelOptions.long_streams(keepalive_time_ms=30000, compression=grpc.Compression.Gzip)
+    assert ('grpc.keepalive_time_ms', 30000) in options.to_list()
+    assert ('grpc.http2.bdp_probe', 1) in options.to_list()
+    assert ('grpc.keepalive_timeout_ms', None) not in ChannelOptions().to_list()
+    with pytest.raises(ValueError):
+        ChannelOptions(compression="gzip")
+
+    streaming_client = ClientSTT("api_key", "c2VjcmV0", channel_options=options, **local_params)
+    unary_client = ClientSTT("api_key", "c2VjcmV0", channel_options=ChannelOptions.unary_calls(), **local_params)
+    assert streaming_client._channel is not unary_client._channel
+    assert streaming_client._compression == grpc.Compression.Gzip
+
+
+def test_raw_channel_options(local_params):
+    default_length = ('grpc.max_receive_message_length', MAX_LENGTH)
+    assert default_length in ClientSTT("api_key", "c2VjcmV0", channel_options=[], **local_params)._options
+
+    raw_options = [('grpc.max_receive_message_length', 1024), ('grpc.keepalive_time_ms', 30000)]
+    options = ClientSTT("api_key", "c2VjcmV0", channel_options=raw_options, **local_params)._options
+    assert default_length not in options
+    assert set(raw_options) <= set(options)
+    assert ('grpc.max_send_message_length', MAX_LENGTH) in options
+
+
+def test_channel_pool_reference_counting():
+    closed = []
+    pool = ChannelPool(idle_timeout=0)
+    first = pool.acquire("key", object)
+    assert pool.acquire("key", object) is first
+    assert pool.release("key") == []
+    closed.extend(pool.release("key"))
+    assert closed == [first]
+    assert len(pool) == 0
+
+
+def test_channel_pool_closes_idle_channels():
+    closed = []
+    pool = ChannelPool(idle_timeout=0.05, close_channel=closed.append)
+    channel = pool.acquire("key", object)
+    assert pool.release("key") == []
+    assert pool.time_to_expire() <= 0.05
+    deadline = time.monotonic() + 5
+    while not closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert closed == [channel]
+    assert len(pool) == 0
+
+    stale = pool.acquire("stale", object)
+    assert pool.prune(lambda key: key == "stale") == [stale]
+    assert pool.release("stale") == []
+
+
+def test_aio_channels_of_closed_loops(local_params):
+    pool = aio_client.BaseClient._channel_pool
+
+    async def make_client():
+        return aio_voicekit.ClientTTS("api_key", "c2VjcmV0", **local_params)._channel_keys[0]
+
+    first_key = asyncio.run(make_client())
+    second_key = asyncio.run(make_client())
+    assert first_key not in pool._channels
+    assert second_key in pool._channels
+
+
+@pytest.mark.asyncio
+async def test_aio_idle_channel_closed(local_params, monkeypatch):
+    pool = aio_client.BaseClient._channel_pool
+    monkeypatch.setattr(pool, "idle_timeout", 0.01)
+    client = aio_voicekit.ClientTTS("api_key", "c2VjcmV0", channel_options=[("test.idle", 1)], **local_params)
+    key = client._channel_keys[0]
+    await client.close()
+    for _ in range(500):
+        if key not in pool._channels:
+            break
+        await asyncio.sleep(0.01)
+    assert key not in pool._channels
+
+
+def test_least_loaded_channel():
+    class Call:
+        def __init__(self, channel):
+            self.channel = channel
+            self.callbacks = []
+
+        def add_done_callback(self, callback):
+            self.callbacks.append(callback)
+
+        def finish(self):
+            for callback in self.callbacks:
+                callback(self)
+
+    class Stub:
+        def __init__(self, channel):
+            self.Stream = lambda: Call(channel)
+
+    stub = BalancedStub(Stub, ["first", "second"])
+    first_call = stub.Stream()
+    second_call = stub.Stream()
+    assert {first_call.channel, second_call.channel} == {"first", "second"}
+    assert stub.in_flight == [1, 1]
+
+    first_call.finish()
+    assert stub.Stream().channel == first_call.channel
+    assert stub.in_flight == [1, 1]
+
+
+@pytest.fixture
+def slow_server(grpc_server):
+    def get_operation(request, context):
+        time.sleep(1)
+        return b""
+
+    return grpc_server(
+        "tinkoff.cloud.longrunning.v1.Operations",
+        {"GetOperation": grpc.unary_unary_rpc_method_handler(get_operation)},
+    )
+
+
+def test_call_timeout(slow_server):
+    client = ClientOperations("api_key", "c2VjcmV0", timeout=0.1, **slow_server)
+    with pytest.raises(grpc.RpcError) as error:
+        client.get_operation({"id": "operation"})
+    assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+    operation = client.get_operation({"id": "operation"}, timeout=5)
+    assert operation["id"] == ""
+    with pytest.raises(ValueError):
+        ClientOperations("api_key", "c2VjcmV0", timeout=0, **slow_server)
+
+
+@pytest.fixture
+def watch_server(grpc_server):
+    def watch_operations(request, context):
+        for _ in range(3):
+            time.sleep(0.2)
+            yield b""
+
+    return grpc_server(
+        "tinkoff.cloud.longrunning.v1.Operations",
+        {"WatchOperations": grpc.unary_stream_rpc_method_handler(watch_operations)},
+    )
+
+
+@pytest.mark.parametrize("shared_channel", [True, False])
+def test_stream_outlives_client(watch_server, monkeypatch, shared_channel):
+    monkeypatch.setattr(base_client.BaseClient._channel_pool, "idle_timeout", 0.05)
+    client = ClientOperations("api_key", "c2VjcmV0", shared_channel=shared_channel, **watch_server)
+    channel = client._channel
+    responses = client.watch_operations({"filter": {}})
+    del client
+    gc.collect()
+    assert len(list(responses)) == 3
+
+    deadline = time.monotonic() + 5
+    while channel.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert channel.in_flight == 0
+
+
+def test_warm_up(local_server):
+    client = ClientTTS("api_key", "c2VjcmV0", channels_count=2, **local_server)
+    client.warm_up(timeout=5)
+
+
+def test_warm_up_timeout(local_params):
+    client = ClientTTS("api_key", "c2VjcmV0", **local_params)
+    with pytest.raises(grpc.FutureTimeoutError):
+        client.warm_up(timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_aio_warm_up(local_server):
+    client = aio_voicekit.ClientTTS("api_key", "c2VjcmV0", **local_server)
+    await client.warm_up(timeout=5)
+    assert client._channel.get_state() == grpc.ChannelConnectivity.READY
+    await client.close()
@@ -0,0 +1,336 @@
+import asyncio
+import io
+import pathlib
+import types
+
+import pytest
+from jsonschema import ValidationError
+
+from tinkoff_voicekit_client.STT import config_schema, helper_stt
+from tinkoff_voicekit_client.TTS.helper_tts import get_proto_synthesize_request
+from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.longrunning.v1 import longrunning_pb2
+from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.stt.v1 import stt_pb2
+from tinkoff_voicekit_client.speech_utils.proto_converter import (
+    message_to_dict,
+    proto_message_to_dict,
+    LazyMessageDict
+)
+from tinkoff_voicekit_client.speech_utils.infrastructure import (
+    get_buffer,
+    aio_get_buffer,
+    aio_read_all,
+    MappedAudio
+)
+from tinkoff_voicekit_client.STT.helper_stt import (
+    get_proto_request,
+    get_first_stream_config,
+    prepare_recognition_config,
+    prepare_streaming_recognition_config,
+    aio_create_stream_requests,
+    create_stream_requests,
+    get_chunk_duration,
+    StreamPacer,
+    ChunkSizer
+)
+from tinkoff_voicekit_client.speech_utils.config_data import CHUNK_SIZE
+
+
+@pytest.fixture
+def streaming_config():
+    return {
+        "config": {
+            "encoding": "LINEAR16",
+            "sample_rate_hertz": 16000,
+            "num_channels": 1,
+        }
+    }
+
+
+async def collect_requests(requests):
+    chunks = []
+    async for request in requests:
+        chunks.append(request.audio_content)
+    return chunks
+
+
+class FakeClock:
+    """
+    Clock of pacing, time moves only by blocking sleeps, all sleeps are recorded
+    """
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self.async_sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    real_sleep = asyncio.sleep
+
+    async def async_sleep(delay):
+        clock.async_sleeps.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(helper_stt, "time", clock)
+    monkeypatch.setattr(helper_stt, "asyncio", types.SimpleNamespace(sleep=async_sleep))
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_aio_stream_requests_do_not_block_loop(streaming_config, clock):
+    audio = bytes(CHUNK_SIZE * 5)
+    results = await asyncio.gather(*[
+        collect_requests(aio_create_stream_requests(
+            io.BytesIO(audio), StreamPacer(streaming_config["config"], 50), streaming_config
+        ))
+        for _ in range(10)
+    ])
+
+    for chunks in results:
+        assert b"".join(chunks) == audio
+    assert clock.sleeps == []
+    assert clock.async_sleeps == [1 / 50] * 50
+
+
+def test_chunk_duration(streaming_config):
+    assert get_chunk_duration(32000, streaming_config["config"]) == 1.0
+    assert get_chunk_duration(32000, {"encoding": "MPEG_AUDIO", "sample_rate_hertz": 16000, "num_channels": 1}) is None
+
+
+def test_audio_pacing(streaming_config, clock):
+    # 0.4 seconds of audio sent at 4x real time
+    audio = bytes(3200 * 4)
+    pacer = StreamPacer(streaming_config["config"], pacing="audio", realtime_factor=4)
+    requests = list(create_stream_requests(io.BytesIO(audio), pacer, streaming_config))
+
+    assert len(requests) == 3
+    assert clock.sleeps == pytest.approx([CHUNK_SIZE / 32000 / 4, (3200 * 4 - CHUNK_SIZE) / 32000 / 4])
+    assert sum(clock.sleeps) == pytest.approx(0.1)
+
+
+def test_audio_pacing_unsupported_encoding(streaming_config):
+    streaming_config["config"]["encoding"] = "RAW_OPUS"
+    with pytest.raises(ValueError):
+        StreamPacer(streaming_config["config"], pacing="audio")
+
+
+def test_chunk_size_in_milliseconds(streaming_config):
+    streaming_config["config"]["num_channels"] = 2
+    sizer = ChunkSizer(streaming_config["config"], chunk_duration_ms=100)
+    assert sizer.chunk_size == 6400
+
+    chunks = list(create_stream_requests(
+        io.BytesIO(bytes(6400 * 3)), StreamPacer(streaming_config["config"], pacing="none"), streaming_config, sizer
+    ))
+    assert [len(request.audio_content) for request in chunks[1:]] == [6400] * 3
+
+
+def test_adaptive_chunk_size(streaming_config):
+    sizer = ChunkSizer(streaming_config["config"], chunk_duration_ms=20, adaptive=True)
+    assert sizer.chunk_size == 640
+
+    sizer.update(lag=0.5, chunk_length=640)
+    assert sizer.chunk_size == 1280
+    for _ in range(10):
+        sizer.update(lag=0.0, chunk_length=1280)
+    assert sizer.chunk_size == 640
+
+
+def test_adaptive_chunk_with_rps_pacing(streaming_config, clock):
+    # 20 ms chunks at 20 requests per second are only 0.4x real time
+    audio = bytes(32000 * 10)
+    sizer = ChunkSizer(streaming_config["config"], chunk_duration_ms=20, adaptive=True)
+    pacer = StreamPacer(streaming_config["config"])
+    sizes = [len(request.audio_content) for request in create_stream_requests(
+        io.BytesIO(audio), pacer, streaming_config, sizer
+    )][1:]
+    assert sizes[:4] == [640, 640, 1280, 2560]
+    # 10 seconds of audio are sent about real time instead of 25 seconds
+    assert sum(clock.sleeps) < 10.5
+
+
+def test_adaptive_chunk_shrinks_below_base_size(streaming_config):
+    sizer = ChunkSizer(streaming_config["config"], chunk_duration_ms=100, adaptive=True)
+    assert sizer.chunk_size == 3200
+
+    sizer.update(lag=0.5, chunk_length=3200)
+    assert sizer.chunk_size == 6400
+    sizes = []
+    for _ in range(50):
+        sizer.update(lag=0.0, chunk_length=sizer.chunk_size)
+        sizes.append(sizer.chunk_size)
+    # shrinks every 10 chunks in time down to MIN_CHUNK_DURATION_MS
+    assert sizes[9::10] == [3200, 1600, 800, 640, 640]
+
+
+def test_mapped_audio_buffer(audio_data):
+    with open(audio_data["source"], "rb") as f:
+        audio = f.read()
+
+    buffer = get_buffer(audio_data["source"])
+    assert isinstance(buffer, MappedAudio)
+    assert len(buffer) == len(audio)
+    assert bytes(buffer.read(100)) == audio[:100]
+    assert bytes(buffer.read()) == audio[100:]
+    assert not buffer.read(100)
+
+    request = get_proto_request(get_buffer(audio_data["source"]), audio_data["config"])
+    assert request.audio.content == audio
+
+
+def test_mapped_audio_context_manager(audio_data, streaming_config):
+    with open(audio_data["source"], "rb") as f:
+        audio = f.read()
+    with get_buffer(audio_data["source"]) as buffer:
+        data = buffer.read()
+    assert bytes(data) == audio
+
+    buffer = get_buffer(audio_data["source"])
+    pacer = StreamPacer(streaming_config["config"], pacing="none")
+    list(create_stream_requests(buffer, pacer, streaming_config, owns_buffer=True))
+    assert buffer._mmap is None
+
+
+@pytest.mark.parametrize("source_type", [bytes, bytearray, memoryview, io.BytesIO, pathlib.Path])
+def test_get_buffer_sources(audio_data, source_type):
+    with open(audio_data["source"], "rb") as f:
+        audio = f.read()
+    source = pathlib.Path(audio_data["source"]) if source_type is pathlib.Path else source_type(audio)
+
+    assert bytes(get_buffer(source).read()) == audio
+
+
+def test_get_buffer_readinto_source():
+    class RawSource:
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        def readinto(self, buffer):
+            return self._data.readinto(buffer)
+
+    buffer = get_buffer(RawSource(b"audio" * 10))
+    assert bytes(buffer.read(5)) == b"audio"
+    assert bytes(buffer.read()) == b"audio" * 9
+
+
+def test_get_buffer_incorrect_source():
+    with pytest.raises(ValueError):
+        get_buffer(42)
+
+
+@pytest.mark.asyncio
+async def test_aio_stream_requests_from_async_iterable(streaming_config):
+    async def chunks():
+        for _ in range(3):
+            yield bytes(5000)
+
+    pacer = StreamPacer(streaming_config["config"], pacing="none")
+    requests = aio_create_stream_requests(aio_get_buffer(chunks()), pacer, streaming_config)
+    audio = await collect_requests(requests)
+    assert [len(chunk) for chunk in audio] == [0, CHUNK_SIZE, 15000 - CHUNK_SIZE]
+
+    buffer = await aio_read_all(aio_get_buffer(chunks()))
+    assert len(buffer) == 15000
+
+
+@pytest.mark.asyncio
+async def test_aio_small_reads_of_large_chunk():
+    async def chunks():
+        yield b"abc" * 1000
+        yield b"d"
+
+    buffer = aio_get_buffer(chunks())
+    parts = [await buffer.read(7) for _ in range(429)]
+    assert b"".join(parts) + await buffer.read() == b"abc" * 1000 + b"d"
+
+
+def test_raw_opus_short_reads(streaming_config):
+    class ShortReads(io.BytesIO):
+        def read(self, size=-1):
+            return super().read(min(size, 3))
+
+    frames = [b"first frame", b"second"]
+    audio = b"".join(len(frame).to_bytes(4, "big") + frame for frame in frames)
+    assert list(helper_stt.generate_audio_chunks(ShortReads(audio), "RAW_OPUS")) == frames
+
+
+def test_compiled_validator(streaming_config):
+    config_schema.streaming_recognition_config_validator.validate(streaming_config)
+    streaming_config["config"]["encoding"] = "WAV"
+    with pytest.raises(ValidationError):
+        config_schema.streaming_recognition_config_validator.validate(streaming_config)
+
+
+def test_proto_config_cache(streaming_config, synthesis_config):
+    template = get_first_stream_config(streaming_config)
+    reordered_config = {"config": dict(reversed(streaming_config["config"].items()))}
+    assert get_first_stream_config(reordered_config) is template
+    assert template.config.sample_rate_hertz == 16000
+
+    request = get_proto_synthesize_request(synthesis_config)
+    request.input.text = "text"
+    assert not get_proto_synthesize_request(synthesis_config).input.text
+
+
+def test_prepared_config(streaming_config):
+    prepared = prepare_streaming_recognition_config(streaming_config)
+    streaming_config["config"]["sample_rate_hertz"] = 8000
+
+    assert prepared["config"]["sample_rate_hertz"] == 16000
+    config_schema.streaming_recognition_config_validator.validate(prepared)
+    requests = create_stream_requests(io.BytesIO(bytes(100)), StreamPacer(prepared["config"], pacing="none"), prepared)
+    assert next(requests).streaming_config.config.sample_rate_hertz == 16000
+
+    with pytest.raises(ValueError):
+        config_schema.recognition_config_validator.validate(prepared)
+    with pytest.raises(ValueError):
+        get_proto_request(io.BytesIO(bytes(100)), prepared)
+
+
+def test_prepared_config_is_validated(streaming_config):
+    with pytest.raises(ValidationError):
+        prepare_recognition_config(streaming_config)
+
+
+@pytest.fixture
+def recognize_response():
+    response = stt_pb2.StreamingRecognizeResponse()
+    result = response.results.add()
+    result.is_final = True
+    result.recognition_result.channel = 1
+    result.recognition_result.end_time.FromMilliseconds(1500)
+    alternative = result.recognition_result.alternatives.add()
+    alternative.transcript = "привет"
+    alternative.confidence = 0.1
+    word = alternative.words.add()
+    word.word = "привет"
+    word.start_time.FromMilliseconds(10)
+    response.results.add()
+    return response
+
+
+def test_message_to_dict(recognize_response):
+    assert message_to_dict(recognize_response) == proto_message_to_dict(recognize_response)
+    assert message_to_dict(recognize_response)["results"][0]["recognition_result"]["end_time"] == "1.500s"
+
+    operation = longrunning_pb2.Operation(id="42", state=longrunning_pb2.DONE)
+    operation.response.Pack(recognize_response)
+    operations = longrunning_pb2.ListOperationsResponse(operations=[operation, longrunning_pb2.Operation()])
+    assert message_to_dict(operations) == proto_message_to_dict(operations)
+
+
+def test_lazy_message_dict(recognize_response):
+    response = LazyMessageDict(recognize_response)
+    alternative = response["results"][0]["recognition_result"]["alternatives"][0]
+    assert alternative["transcript"] == "привет"
+    assert "recognition_result" not in response["results"][1]
+    assert response == message_to_dict(recognize_response)
+    assert dict(response["results"][0]) == message_to_dict(recognize_response.results[0])
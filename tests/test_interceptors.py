@@ -0,0 +1,154 @@
+import asyncio
+
+import grpc
+import pytest
+
+from tinkoff_voicekit_client import ClientOperations, ClientSTT, aio_voicekit
+from tinkoff_voicekit_client.speech_utils.BaseClient import aio_interceptors, interceptors
+from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.stt.v1 import stt_pb2
+
+GET_OPERATION = "/tinkoff.cloud.longrunning.v1.Operations/GetOperation"
+STREAMING_RECOGNIZE = "/tinkoff.cloud.stt.v1.SpeechToText/StreamingRecognize"
+
+
+@pytest.fixture
+def flaky_server(grpc_server):
+    calls = []
+
+    def get_operation(request, context):
+        calls.append(request)
+        if len(calls) % 2:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "try again")
+        return b""
+
+    params = grpc_server(
+        "tinkoff.cloud.longrunning.v1.Operations",
+        {"GetOperation": grpc.unary_unary_rpc_method_handler(get_operation)},
+    )
+    return params, calls
+
+
+def test_interceptors(flaky_server):
+    params, calls = flaky_server
+    timings = []
+    metrics = interceptors.MetricsInterceptor()
+    client = ClientOperations(
+        "api_key",
+        "c2VjcmV0",
+        interceptors=[
+            metrics,
+            interceptors.TimingInterceptor(lambda *timing: timings.append(timing)),
+            interceptors.RetryInterceptor(interceptors.RetryPolicy(initial_backoff=0.01)),
+        ],
+        **params
+    )
+    assert client.get_operation({"id": "operation"}, timeout=5)["id"] == ""
+    assert len(calls) == 2
+    assert [(method, code) for method, _, code in timings] == [(GET_OPERATION, grpc.StatusCode.OK)]
+    assert metrics.metrics.codes == {(GET_OPERATION, grpc.StatusCode.OK): 1}
+    assert metrics.metrics.in_flight[GET_OPERATION] == 0
+
+    no_retry_client = ClientOperations("api_key", "c2VjcmV0", interceptors=[metrics], **params)
+    with pytest.raises(grpc.RpcError):
+        no_retry_client.get_operation({"id": "operation"}, timeout=5)
+    assert metrics.metrics.codes[GET_OPERATION, grpc.StatusCode.UNAVAILABLE] == 1
+
+
+@pytest.mark.asyncio
+async def test_aio_interceptors(flaky_server):
+    params, calls = flaky_server
+    metrics = aio_interceptors.MetricsInterceptor()
+    client = aio_voicekit.ClientOperations(
+        "api_key",
+        "c2VjcmV0",
+        interceptors=[
+            metrics,
+            aio_interceptors.RetryInterceptor(interceptors.RetryPolicy(initial_backoff=0.01)),
+        ],
+        **params
+    )
+    operation = await client.get_operation({"id": "operation"}, timeout=5)
+    assert operation["id"] == ""
+    assert len(calls) == 2
+    await client.close()
+    assert metrics.metrics.codes == {(GET_OPERATION, grpc.StatusCode.OK): 1}
+
+
+@pytest.fixture
+def recognition_server(grpc_server):
+    def streaming_recognize(requests, context):
+        for request in requests:
+            if request.audio_content:
+                yield stt_pb2.StreamingRecognizeResponse(results=[
+                    stt_pb2.StreamingRecognitionResult(is_final=False),
+                    stt_pb2.StreamingRecognitionResult(is_final=True),
+                ])
+
+    return grpc_server(
+        "tinkoff.cloud.stt.v1.SpeechToText",
+        {"StreamingRecognize": grpc.stream_stream_rpc_method_handler(
+            streaming_recognize,
+            request_deserializer=stt_pb2.StreamingRecognizeRequest.FromString,
+            response_serializer=stt_pb2.StreamingRecognizeResponse.SerializeToString,
+        )},
+    )
+
+
+@pytest.fixture
+def streaming_config():
+    return {"config": {"encoding": "LINEAR16", "sample_rate_hertz": 16000, "num_channels": 1}}
+
+
+def test_stream_metrics(recognition_server, streaming_config):
+    metrics = interceptors.CallMetrics()
+    client = ClientSTT("api_key", "c2VjcmV0", metrics=metrics, **recognition_server)
+    other_client = ClientSTT("api_key", "c2VjcmV0", metrics=metrics, **recognition_server)
+    assert other_client._channel is client._channel
+
+    responses = list(client.streaming_recognize(bytes(16000), streaming_config, pacing="none", timeout=5))
+    assert len(responses) == 2
+    assert metrics.codes == {(STREAMING_RECOGNIZE, grpc.StatusCode.OK): 1}
+    assert metrics.bytes_sent[STREAMING_RECOGNIZE] > 16000
+    assert metrics.bytes_received[STREAMING_RECOGNIZE] > 0
+    assert metrics.first_response_count[STREAMING_RECOGNIZE] == 1
+    assert metrics.final_result_count[STREAMING_RECOGNIZE] == 1
+
+
+@pytest.mark.asyncio
+async def test_aio_stream_metrics(recognition_server):
+    async def requests():
+        yield stt_pb2.StreamingRecognizeRequest(audio_content=bytes(16000))
+
+    metrics = interceptors.CallMetrics()
+    target = "{host}:{port}".format(**recognition_server)
+    channel_interceptors = aio_interceptors.channel_interceptors([aio_interceptors.MetricsInterceptor(metrics)])
+    async with grpc.aio.insecure_channel(target, interceptors=channel_interceptors) as channel:
+        streaming_recognize = channel.stream_stream(
+            STREAMING_RECOGNIZE,
+            request_serializer=stt_pb2.StreamingRecognizeRequest.SerializeToString,
+            response_deserializer=stt_pb2.StreamingRecognizeResponse.FromString,
+        )
+        responses = [response async for response in streaming_recognize(requests(), timeout=5)]
+    # aio calls are reported by task scheduled from done callback
+    await asyncio.sleep(0)
+    assert len(responses) == 1
+    assert metrics.codes == {(STREAMING_RECOGNIZE, grpc.StatusCode.OK): 1}
+    assert metrics.bytes_sent[STREAMING_RECOGNIZE] > 16000
+    assert metrics.first_response_count[STREAMING_RECOGNIZE] == 1
+    assert metrics.final_result_count[STREAMING_RECOGNIZE] == 1
+
+
+def test_prometheus_metrics(recognition_server, streaming_config):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from tinkoff_voicekit_client.speech_utils.BaseClient.metrics import PrometheusMetrics
+
+    registry = prometheus_client.CollectorRegistry()
+    client = ClientSTT("api_key", "c2VjcmV0", metrics=PrometheusMetrics(registry), **recognition_server)
+    list(client.streaming_recognize(bytes(16000), streaming_config, pacing="none", timeout=5))
+
+    method = {"method": STREAMING_RECOGNIZE.lstrip("/")}
+    assert registry.get_sample_value("voicekit_client_calls_total", dict(method, code="OK")) == 1
+    assert registry.get_sample_value("voicekit_client_call_duration_seconds_count", method) == 1
+    assert registry.get_sample_value("voicekit_client_calls_in_flight", method) == 0
+    assert registry.get_sample_value("voicekit_client_stream_final_result_seconds_count", method) == 1
+    assert registry.get_sample_value("voicekit_client_sent_bytes_total", method) > 16000
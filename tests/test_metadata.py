@@ -0,0 +1,77 @@
+from concurrent import futures
+
+import grpc
+import pytest
+
+from tinkoff_voicekit_client.speech_utils import metadata as metadata_module
+from tinkoff_voicekit_client import ClientTTS
+from tinkoff_voicekit_client.speech_utils.metadata import Metadata, MetadataPlugin, token_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000000.0]
+    monkeypatch.setattr(metadata_module, "time", lambda: now[0])
+    token_cache.clear()
+    yield now
+    token_cache.clear()
+
+
+def test_jwt_refresh_ahead_of_expiry(clock):
+    metadata = Metadata("api_key", "c2VjcmV0", aud="tinkoff.cloud.tts")
+    first = metadata.metadata
+    assert isinstance(first, tuple)
+    assert dict(first)["x-api-key"] == "api_key"
+
+    clock[0] += Metadata._TEN_MINUTES * Metadata._REFRESH_RATIO - 1
+    assert metadata.metadata is first
+
+    clock[0] += 1
+    second = metadata.metadata
+    assert second != first
+    assert metadata.is_fresh_jwt()
+
+
+def test_token_cache_shared_between_clients(clock):
+    stt_metadata = Metadata("api_key", "c2VjcmV0", aud="tinkoff.cloud.stt")
+    assert Metadata("api_key", "c2VjcmV0", aud="tinkoff.cloud.stt").metadata is stt_metadata.metadata
+    assert Metadata("api_key", "c2VjcmV0", aud="tinkoff.cloud.tts").metadata != stt_metadata.metadata
+    assert Metadata("other_key", "c2VjcmV0", aud="tinkoff.cloud.stt").metadata != stt_metadata.metadata
+
+    clock[0] += Metadata._TEN_MINUTES
+    with futures.ThreadPoolExecutor(max_workers=8) as executor:
+        tokens = set(map(id, executor.map(lambda _: stt_metadata.metadata, range(100))))
+    assert len(tokens) == 1
+
+
+@pytest.fixture
+def echo_metadata_server(grpc_server):
+    def echo(request, context):
+        return "\n".join("{}={}".format(*item) for item in context.invocation_metadata()).encode("utf-8")
+
+    params = grpc_server(
+        "test.Echo",
+        {"Metadata": grpc.unary_unary_rpc_method_handler(echo)},
+        credentials=grpc.local_server_credentials(),
+    )
+    return "{host}:{port}".format(**params)
+
+
+def test_metadata_plugin(echo_metadata_server):
+    metadata = Metadata("api_key", "c2VjcmV0", aud="tinkoff.cloud.tts")
+    credentials = grpc.metadata_call_credentials(MetadataPlugin(metadata))
+    with grpc.secure_channel(echo_metadata_server, grpc.local_channel_credentials()) as channel:
+        echo = channel.unary_unary("/test.Echo/Metadata")
+        response = echo(b"", credentials=credentials, timeout=5).decode("utf-8")
+    assert "authorization={}".format(dict(metadata.metadata)["authorization"]) in response.split("\n")
+    assert "x-api-key=api_key" in response.split("\n")
+
+
+def test_call_options():
+    secure_client = ClientTTS("api_key", "c2VjcmV0", host="localhost", port=50051)
+    assert set(secure_client._call_options()) == {"credentials", "timeout"}
+    user_metadata = (("authorization", "Bearer token"),)
+    assert secure_client._call_options(user_metadata, 5) == {"metadata": user_metadata, "timeout": 5}
+
+    insecure_client = ClientTTS("api_key", "c2VjcmV0", host="localhost", port=50051, ssl_channel=False)
+    assert insecure_client._call_options()["metadata"] is insecure_client._metadata.metadata
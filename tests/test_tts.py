@@ -0,0 +1,280 @@
+import io
+import os
+import threading
+import time
+import wave
+
+import grpc
+import pytest
+
+from tinkoff_voicekit_client import ClientTTS, SynthesisCache, aio_voicekit
+from tinkoff_voicekit_client.TTS.helper_tts import get_encoder, save_synthesize_wav, WavWriter
+from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.tts.v1 import tts_pb2
+
+
+def test_linear16_chunks_stay_bytes(tmp_path):
+    get_chunk = get_encoder("LINEAR16", 48000)
+    audio = bytearray()
+    for chunk in (b"\x01\x00" * 100, b"\xff\x7f" * 50):
+        audio += get_chunk(chunk)
+    assert len(audio) == 300
+
+    file_name = str(tmp_path / "audio.wav")
+    save_synthesize_wav(audio, file_name, 48000)
+    with wave.open(file_name, "rb") as wav_in:
+        assert wav_in.getnframes() == 150
+        assert wav_in.readframes(150) == audio
+
+    with pytest.raises(NotImplementedError):
+        get_encoder("MULAW", 48000)
+
+
+def test_wav_writer_file_like():
+    output = io.BytesIO(b"prefix")
+    output.seek(0, io.SEEK_END)
+    with WavWriter(output, 16000) as wav_out:
+        for _ in range(10):
+            wav_out.write(memoryview(b"\x01\x02" * 160))
+    assert wav_out.data_length == 3200
+
+    output.seek(len(b"prefix"))
+    with wave.open(output, "rb") as wav_in:
+        assert wav_in.getframerate() == 16000
+        assert wav_in.getnframes() == 1600
+        assert wav_in.readframes(1600) == b"\x01\x02" * 1600
+
+
+def test_wav_writer_not_seekable():
+    class Stream(io.RawIOBase):
+        def __init__(self):
+            self.data = bytearray()
+
+        def writable(self):
+            return True
+
+        def write(self, data):
+            self.data += data
+            return len(data)
+
+    stream = Stream()
+    with WavWriter(stream, 16000) as wav_out:
+        wav_out.write(bytes(320))
+    assert len(stream.data) == 44 + 320
+    assert stream.data[40:44] == b"\xff\xff\xff\xff"
+
+
+@pytest.fixture
+def voices_requests():
+    return []
+
+
+@pytest.fixture
+def synthesize_requests():
+    return []
+
+
+class InFlight:
+    def __init__(self):
+        self.current = 0
+        self.max = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.max = max(self.max, self.current)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with self._lock:
+            self.current -= 1
+
+
+@pytest.fixture
+def streaming_in_flight():
+    return InFlight()
+
+
+@pytest.fixture
+def synthesis_server(grpc_server, voices_requests, synthesize_requests, streaming_in_flight):
+    def streaming_synthesize(request, context):
+        with streaming_in_flight:
+            # the first lines are the slowest to check that order of lines is kept
+            text = request.input.text
+            time.sleep(0.05 * (3 - int(text)))
+            for _ in range(2):
+                yield tts_pb2.StreamingSynthesizeSpeechResponse(audio_chunk=text.encode() * 2)
+
+    def synthesize(request, context):
+        synthesize_requests.append(request)
+        return tts_pb2.SynthesizeSpeechResponse(audio_content=request.input.text.encode() * 2)
+
+    def list_voices(request, context):
+        voices_requests.append(request)
+        return tts_pb2.ListVoicesResponses(voices=[tts_pb2.Voice(name="alyona", language_codes=["ru-RU"])])
+
+    return grpc_server(
+        "tinkoff.cloud.tts.v1.TextToSpeech",
+        {
+            "StreamingSynthesize": grpc.unary_stream_rpc_method_handler(
+                streaming_synthesize,
+                request_deserializer=tts_pb2.SynthesizeSpeechRequest.FromString,
+                response_serializer=tts_pb2.StreamingSynthesizeSpeechResponse.SerializeToString,
+            ),
+            "Synthesize": grpc.unary_unary_rpc_method_handler(
+                synthesize,
+                request_deserializer=tts_pb2.SynthesizeSpeechRequest.FromString,
+                response_serializer=tts_pb2.SynthesizeSpeechResponse.SerializeToString,
+            ),
+            "ListVoices": grpc.unary_unary_rpc_method_handler(
+                list_voices,
+                request_deserializer=tts_pb2.ListVoicesRequest.FromString,
+                response_serializer=tts_pb2.ListVoicesResponses.SerializeToString,
+            ),
+        },
+    )
+
+
+@pytest.fixture
+def synthesis_config():
+    return {"audio_encoding": "LINEAR16", "sample_rate_hertz": 16000}
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    text_file = tmp_path / "text.txt"
+    text_file.write_text("0\n1\n2\n")
+    return str(text_file)
+
+
+def check_wav_rows(output_dir, rows):
+    for index in range(rows):
+        with wave.open(str(output_dir / "row_{0}.wav".format(index)), "rb") as wav_in:
+            assert wav_in.readframes(wav_in.getnframes()) == str(index).encode() * 4
+
+
+def test_concurrent_synthesis(synthesis_server, synthesis_config, text_file, tmp_path, streaming_in_flight):
+    client = ClientTTS("api_key", "c2VjcmV0", **synthesis_server)
+    responses = client.streaming_synthesize(text_file, synthesis_config, concurrency=3, timeout=5)
+    texts = [b"".join(response.audio_chunk for response in row) for row in responses]
+    assert texts == [b"0000", b"1111", b"2222"]
+    assert streaming_in_flight.max == 3
+
+    for concurrency in (1, 2):
+        streaming_in_flight.max = 0
+        client.synthesize_to_audio_wav(
+            text_file, synthesis_config, "row", output_dir=str(tmp_path), concurrency=concurrency
+        )
+        check_wav_rows(tmp_path, 3)
+        assert streaming_in_flight.max == concurrency
+
+    with pytest.raises(ValueError):
+        list(client.streaming_synthesize("0", synthesis_config, concurrency=0))
+
+
+@pytest.mark.asyncio
+async def test_aio_concurrent_synthesis(synthesis_server, synthesis_config, text_file, tmp_path, streaming_in_flight):
+    client = aio_voicekit.ClientTTS("api_key", "c2VjcmV0", **synthesis_server)
+    texts = []
+    async for row in client.streaming_synthesize(text_file, synthesis_config, concurrency=3, timeout=5):
+        texts.append(b"".join([response.audio_chunk async for response in row]))
+    assert texts == [b"0000", b"1111", b"2222"]
+    assert streaming_in_flight.max == 3
+
+    for concurrency in (1, 2):
+        streaming_in_flight.max = 0
+        await client.synthesize_to_audio_wav(
+            text_file, synthesis_config, "row", output_dir=str(tmp_path), concurrency=concurrency
+        )
+        check_wav_rows(tmp_path, 3)
+        assert streaming_in_flight.max == concurrency
+    await client.close()
+
+
+def test_synthesize_and_voices(synthesis_server, synthesis_config, voices_requests):
+    client = ClientTTS("api_key", "c2VjcmV0", voices_ttl=60, **synthesis_server)
+    assert client.synthesize("1", synthesis_config, timeout=5) == b"11"
+
+    assert client.list_voices() == {"voices": [{
+        "language_codes": ["ru-RU"], "name": "alyona", "ssml_gender": "SSML_VOICE_GENDER_UNSPECIFIED",
+        "natural_sample_rate_hertz": 0,
+    }]}
+    client.check_voice(dict(synthesis_config, voice={"name": "alyona"}))
+    with pytest.raises(ValueError):
+        client.check_voice(dict(synthesis_config, voice={"name": "maxim"}))
+    assert len(voices_requests) == 1
+
+    client.list_voices(refresh=True)
+    client.list_voices("ru-RU")
+    assert [request.language_code for request in voices_requests] == ["", "", "ru-RU"]
+
+
+@pytest.mark.asyncio
+async def test_aio_synthesize_and_voices(synthesis_server, synthesis_config, voices_requests):
+    client = aio_voicekit.ClientTTS("api_key", "c2VjcmV0", voices_ttl=0, **synthesis_server)
+    audio, response_meta = await client.synthesize("2", synthesis_config, with_response_meta=True, timeout=5)
+    assert audio == b"22"
+
+    voices = await client.list_voices(dict_format=False)
+    assert [voice.name for voice in voices.voices] == ["alyona"]
+    await client.check_voice(dict(synthesis_config, voice={"name": "alyona"}))
+    assert len(voices_requests) == 2
+    await client.close()
+
+
+def test_synthesis_cache_tiers(tmp_path):
+    cache = SynthesisCache(memory_items=1, directory=str(tmp_path), disk_size=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("b") == b"bbbb"
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    # "b" is least recently used file
+    assert cache.get("b") is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.audio", "c.audio"]
+    assert cache.stats() == {
+        "hits": 2, "memory_hits": 1, "disk_hits": 1, "misses": 1,
+        "memory_items": 1, "disk_items": 2, "disk_size": 8,
+    }
+
+    reopened = SynthesisCache(directory=str(tmp_path), disk_size=10)
+    assert reopened.get("a") == b"aaaa"
+    assert reopened.stats()["disk_items"] == 2
+    reopened.clear()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_synthesis_cache_trims_directory(tmp_path):
+    for index, key in enumerate("abc"):
+        path = tmp_path / (key + ".audio")
+        path.write_bytes(bytes(4))
+        os.utime(str(path), (index, index))
+    cache = SynthesisCache(directory=str(tmp_path), disk_size=8)
+    assert cache.get("a") is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b.audio", "c.audio"]
+    assert cache.stats()["disk_size"] == 8
+
+
+def test_synthesize_cache(synthesis_server, synthesis_config, synthesize_requests):
+    cache = SynthesisCache()
+    client = ClientTTS("api_key", "c2VjcmV0", synthesis_cache=cache, **synthesis_server)
+    assert client.synthesize("1", synthesis_config, timeout=5) == b"11"
+    assert client.synthesize("1", synthesis_config, with_response_meta=True, timeout=5) == (b"11", None)
+    assert client.synthesize("1", dict(synthesis_config, speaking_rate=1.5), timeout=5) == b"11"
+    assert len(synthesize_requests) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_aio_synthesize_cache(synthesis_server, synthesis_config, synthesize_requests, tmp_path):
+    cache = SynthesisCache(memory_items=0, directory=str(tmp_path))
+    read_threads = []
+    read = cache._read
+    cache._read = lambda key: read_threads.append(threading.current_thread()) or read(key)
+    client = aio_voicekit.ClientTTS("api_key", "c2VjcmV0", synthesis_cache=cache, **synthesis_server)
+    for _ in range(3):
+        assert await client.synthesize("3", synthesis_config, timeout=5) == b"33"
+    assert len(synthesize_requests) == 1
+    assert (cache.disk_hits, cache.misses) == (2, 1)
+    # disk tier isn't read by event loop thread
+    assert len(read_threads) == 2 and threading.current_thread() not in read_threads
+    await client.close()
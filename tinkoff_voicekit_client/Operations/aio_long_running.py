@@ -1,5 +1,3 @@
-from jsonschema import validate
-
 from tinkoff_voicekit_client.Operations import config_schema
 from tinkoff_voicekit_client.Operations.helper_operations import (
     get_proto_operation_request,
@@ -9,6 +7,7 @@ from tinkoff_voicekit_client.Operations.helper_operations import (
     get_proto_wait_operation_request
 )
 from tinkoff_voicekit_client.speech_utils.BaseClient import aio_client
+from tinkoff_voicekit_client.speech_utils.BaseClient.channel_options import ChannelOptions
 from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.longrunning.v1.longrunning_pb2_grpc import OperationsStub
 from tinkoff_voicekit_client.speech_utils.config_data import client_config, aud
 from tinkoff_voicekit_client.speech_utils.infrastructure import response_format, aio_dict_generator
@@ -24,7 +23,14 @@ class ClientOperations(aio_client.BaseClient):
             host: str = client_config["host_operations"],
             port: int = client_config["port"],
             ssl_channel: bool = True,
-            ca_file: str = None
+            ca_file: str = None,
+            shared_channel: bool = True,
+            channels_count: int = 1,
+            channel_options: ChannelOptions = None,
+            timeout: float = None,
+            auth_plugin: bool = True,
+            interceptors: list = None,
+            metrics=None,
     ):
         """
         Create async client for long running operations.
@@ -33,93 +39,147 @@ class ClientOperations(aio_client.BaseClient):
             :param host: Tinkoff Voicekit speech operations host url
             :param port: Tinkoff Voicekit speech operations port, default value: 443
             :param ca_file: optional certificate file
+            :param shared_channel: share grpc channel with other clients with the same host and options
+            :param channels_count: number of grpc channels (connections), new call goes to the least loaded one
+            :param channel_options: ChannelOptions (or list of raw grpc options) tuning keepalive, flow control,
+                message sizes and compression of grpc channel
+            :param timeout: default deadline of every call in seconds, no deadline by default
+            :param auth_plugin: attach authorization by grpc call credentials on ssl channel
+                instead of passing metadata to every call
+            :param interceptors: list of grpc client interceptors, e.g. from speech_utils.BaseClient.aio_interceptors
+            :param metrics: collect metrics of every call, e.g. speech_utils.BaseClient.metrics.PrometheusMetrics
+                or speech_utils.BaseClient.interceptors.CallMetrics
         """
-        super().__init__(host, port, ssl_channel, ca_file)
+        super().__init__(
+            host,
+            port,
+            ssl_channel,
+            ca_file,
+            options=channel_options,
+            shared_channel=shared_channel,
+            channels_count=channels_count,
+            timeout=timeout,
+            auth_plugin=auth_plugin,
+            interceptors=interceptors,
+            metrics=metrics,
+        )
         self._metadata = Metadata(api_key, secret_key, aud["operations"])
         self._api_key = api_key
         self._secret_key = secret_key
-        self._stub = OperationsStub(self._channel)
+        self._stub = self._make_stub(OperationsStub)
 
-    async def get_operation(self, request: dict, metadata=None, dict_format=True):
+    async def get_operation(self, request: dict, metadata=None, dict_format=True, validate=True, timeout=None):
         """
         Return operation by operation ID
             :param request: operation request
             :param metadata: configure own metadata
-            :param dict_format: dict response instead of proto object
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
         """
-        validate(request, config_schema.get_operation_config_schema)
+        if validate:
+            config_schema.get_operation_config_validator.validate(request)
         response = await self._stub.GetOperation(
             get_proto_operation_request(request),
-            metadata=metadata if metadata else self._metadata.metadata,
+            **self._call_options(metadata, timeout)
         )
         return response_format(response, dict_format)
 
-    async def delete_operation(self, operation_filter: dict, metadata=None, dict_format=True):
+    async def delete_operation(
+            self,
+            operation_filter: dict,
+            metadata=None,
+            dict_format=True,
+            validate=True,
+            timeout=None,
+    ):
         """
         Delete all operations matching operation filter
             :param operation_filter: configure operation filter
             :param metadata: configure own metadata
-            :param dict_format: dict response instead of proto object
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
         """
-        validate(operation_filter, config_schema.operation_filter_config_schema)
+        if validate:
+            config_schema.operation_filter_config_validator.validate(operation_filter)
         response = await self._stub.DeleteOperation(
             get_proto_delete_operation_request(operation_filter),
-            metadata=metadata if metadata else self._metadata.metadata,
+            **self._call_options(metadata, timeout)
         )
         return response_format(response, dict_format)
 
-    async def cancel_operation(self, operation_filter: dict, metadata=None, dict_format=True):
+    async def cancel_operation(
+            self,
+            operation_filter: dict,
+            metadata=None,
+            dict_format=True,
+            validate=True,
+            timeout=None,
+    ):
         """
         Cancel all operations matching operation filter
             :param operation_filter: configure operation filter
             :param metadata: configure own metadata
-            :param dict_format: dict response instead of proto object
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
         """
-        validate(operation_filter, config_schema.operation_filter_config_schema)
+        if validate:
+            config_schema.operation_filter_config_validator.validate(operation_filter)
         response = await self._stub.CancelOperation(
             get_proto_delete_operation_request(operation_filter),
-            metadata=metadata if metadata else self._metadata.metadata,
+            **self._call_options(metadata, timeout)
         )
         return response_format(response, dict_format)
 
-    async def list_operations(self, request: dict, metadata=None, dict_format=True):
+    async def list_operations(self, request: dict, metadata=None, dict_format=True, validate=True, timeout=None):
         """
         Return list with operations
             :param request: configure list operation request
             :param metadata: configure own metadata
-            :param dict_format: dict response instead of proto object
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
         """
-        validate(request, config_schema.list_operations_config_schema)
+        if validate:
+            config_schema.list_operations_config_validator.validate(request)
         response = await self._stub.ListOperations(
             get_proto_list_operations_request(request),
-            metadata=metadata if metadata else self._metadata.metadata,
+            **self._call_options(metadata, timeout)
         )
         return response_format(response, dict_format)
 
-    async def watch_operations(self, request: dict, metadata=None, dict_format=True):
+    async def watch_operations(self, request: dict, metadata=None, dict_format=True, validate=True, timeout=None):
         """
         Watch operations
             :param request: watch operations request
             :param metadata: configure own metadata
-            :param dict_format: dict response instead of proto object
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the whole stream in seconds, default is client timeout
         """
-        validate(request, config_schema.watch_operations_config_schema)
+        if validate:
+            config_schema.watch_operations_config_validator.validate(request)
         response = self._stub.WatchOperations(
             get_proto_watch_operations_request(request),
-            metadata=metadata if metadata else self._metadata.metadata,
+            **self._call_options(metadata, timeout)
         )
         return aio_dict_generator(response, dict_format)
 
-    async def wait_operation(self, request: dict, metadata=None, dict_format=True):
+    async def wait_operation(self, request: dict, metadata=None, dict_format=True, validate=True, timeout=None):
         """
         Wait operation
             :param request: wait operation request
             :param metadata:  configure own metadata
-            :param dict_format: dict response instead of proto object
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
         """
-        validate(request, config_schema.wait_operation_config_schema)
+        if validate:
+            config_schema.wait_operation_config_validator.validate(request)
         response = await self._stub.WaitOperation(
             get_proto_wait_operation_request(request),
-            metadata=metadata if metadata else self._metadata.metadata,
+            **self._call_options(metadata, timeout)
         )
         return response_format(response, dict_format)
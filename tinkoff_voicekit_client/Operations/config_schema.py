@@ -1,3 +1,5 @@
+from tinkoff_voicekit_client.speech_utils.infrastructure import ConfigValidator
+
 definitions = {
     "OperationStateFilter": {
         "type": "string",
@@ -70,3 +72,9 @@ watch_operations_config_schema = {
         "listen_for_updates": {"type": "boolean"}
     }
 }
+
+operation_filter_config_validator = ConfigValidator(operation_filter_config_schema)
+list_operations_config_validator = ConfigValidator(list_operations_config_schema)
+get_operation_config_validator = ConfigValidator(get_operation_config_schema)
+wait_operation_config_validator = ConfigValidator(wait_operation_config_schema)
+watch_operations_config_validator = ConfigValidator(watch_operations_config_schema)
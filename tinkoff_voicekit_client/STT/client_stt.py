@@ -1,15 +1,24 @@
-from jsonschema import validate
-
 from tinkoff_voicekit_client.STT import config_schema
 from tinkoff_voicekit_client.STT.helper_stt import (
     get_proto_request,
     get_proto_longrunning_request,
-    create_stream_requests
+    create_stream_requests,
+    StreamPacer,
+    ChunkSizer,
+    prepare_recognition_config,
+    prepare_streaming_recognition_config,
+    prepare_longrunning_recognition_config
 )
 from tinkoff_voicekit_client.speech_utils.BaseClient.base_client import BaseClient
+from tinkoff_voicekit_client.speech_utils.BaseClient.channel_options import ChannelOptions
 from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.stt.v1.stt_pb2_grpc import SpeechToTextStub
 from tinkoff_voicekit_client.speech_utils.config_data import client_config, aud
-from tinkoff_voicekit_client.speech_utils.infrastructure import get_buffer, dict_generator, response_format
+from tinkoff_voicekit_client.speech_utils.infrastructure import (
+    get_buffer,
+    close_buffer,
+    dict_generator,
+    response_format
+)
 from tinkoff_voicekit_client.speech_utils.metadata import Metadata
 from tinkoff_voicekit_client.Uploader.uploader import Uploader
 
@@ -24,7 +33,14 @@ class ClientSTT(BaseClient):
             port: int = client_config["port"],
             ssl_channel: bool = True,
             ca_file: str = None,
-            uploader_config: dict = None
+            uploader_config: dict = None,
+            shared_channel: bool = True,
+            channels_count: int = 1,
+            channel_options: ChannelOptions = None,
+            timeout: float = None,
+            auth_plugin: bool = True,
+            interceptors: list = None,
+            metrics=None,
     ):
         """
         Create client for speech recognition.
@@ -34,31 +50,91 @@ class ClientSTT(BaseClient):
             :param port: Tinkoff Voicekit speech recognition port, default value: 443
             :param ca_file: optional certificate file
             :uploader_config: config for Uploader
+            :param shared_channel: share grpc channel with other clients with the same host and options
+            :param channels_count: number of grpc channels (connections), new call goes to the least loaded one
+            :param channel_options: ChannelOptions (or list of raw grpc options) tuning keepalive, flow control,
+                message sizes and compression of grpc channel
+            :param timeout: default deadline of every call in seconds, no deadline by default
+            :param auth_plugin: attach authorization by grpc call credentials on ssl channel
+                instead of passing metadata to every call
+            :param interceptors: list of grpc client interceptors, e.g. from speech_utils.BaseClient.interceptors
+            :param metrics: collect metrics of every call, e.g. speech_utils.BaseClient.metrics.PrometheusMetrics
+                or speech_utils.BaseClient.interceptors.CallMetrics
         """
-        super().__init__(host, port, ssl_channel, ca_file)
+        super().__init__(
+            host,
+            port,
+            ssl_channel,
+            ca_file,
+            options=channel_options,
+            shared_channel=shared_channel,
+            channels_count=channels_count,
+            timeout=timeout,
+            auth_plugin=auth_plugin,
+            interceptors=interceptors,
+            metrics=metrics,
+        )
         self._metadata = Metadata(api_key, secret_key, aud=aud["stt"])
         self._api_key = api_key
         self._secret_key = secret_key
-        self._stub = SpeechToTextStub(self._channel)
+        self._stub = self._make_stub(SpeechToTextStub)
 
         uploader_config = {} if uploader_config is None else uploader_config
         self._uploader = Uploader(self._api_key, self._secret_key, **uploader_config)
 
-    def recognize(self, source, config, metadata=None, dict_format=True, with_response_meta=False):
+    def prepare_recognition(self, config: dict):
         """
-        Recognize whole audio and then return all responses.
-            :param source: path to audio file or buffer with audio
+        Validate config and build proto config once for recognize calls.
             :param config: dict conforming to recognition_config_schema
-            :param dict_format: dict response instead of proto object
+        """
+        return prepare_recognition_config(config)
+
+    def prepare_streaming_recognition(self, config: dict):
+        """
+        Validate config and build proto config once for streaming_recognize calls.
+            :param config: dict conforming to streaming_recognition_config_schema
+        """
+        return prepare_streaming_recognition_config(config)
+
+    def prepare_longrunning_recognition(self, config: dict):
+        """
+        Validate config and build proto config once for longrunning_recognize calls.
+            :param config: dict conforming to long_running_recognition_schema
+        """
+        return prepare_longrunning_recognition_config(config)
+
+    def recognize(
+            self,
+            source,
+            config,
+            metadata=None,
+            dict_format=True,
+            with_response_meta=False,
+            validate=True,
+            timeout=None,
+    ):
+        """
+        Recognize whole audio and then return all responses.
+            :param source: path to audio file, bytes-like or file-like object
+            :param config: dict conforming to recognition_config_schema or result of prepare_recognition
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
             :param with_response_meta: return response with metadata
             :param metadata: configure own metadata
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
         """
-        validate(config, config_schema.recognition_config_schema)
+        if validate:
+            config_schema.recognition_config_validator.validate(config)
         buffer = get_buffer(source)
+        try:
+            request = get_proto_request(buffer, config)
+        finally:
+            if buffer is not source:
+                close_buffer(buffer)
 
         response, unary_obj = self._stub.Recognize.with_call(
-            get_proto_request(buffer, config),
-            metadata=metadata if metadata else self._metadata.metadata
+            request,
+            **self._call_options(metadata, timeout)
         )
 
         response_meta = unary_obj.initial_metadata() if with_response_meta else None
@@ -72,48 +148,83 @@ class ClientSTT(BaseClient):
             dict_format=True,
             with_response_meta=False,
             rps=20,
+            pacing="rps",
+            realtime_factor=1.0,
+            chunk_duration_ms=None,
+            adaptive_chunk=False,
+            validate=True,
+            timeout: float = None,
     ):
         """
         Recognize audio in streaming mode.
         Stream audio chunks to server and get streaming responses.
-            :param source: path to audio file or audio stream
+            :param source: path to audio file, bytes-like or file-like object
             :param config: dict conforming to streaming_recognition_config_schema
-            :param dict_format: dict response instead of proto object
+                or result of prepare_streaming_recognition
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
             :param metadata: configure own metadata
             :param with_response_meta: return response with metadata
             :param rps: configure rps for streaming requests
+            :param pacing: "rps" - send requests with fixed rps,
+                "audio" - send audio at real time speed multiplied by realtime_factor,
+                "none" - send audio as fast as server accepts it
+            :param realtime_factor: speed multiplier of real time for "audio" pacing
+            :param chunk_duration_ms: size of audio chunks in milliseconds, default chunk size is CHUNK_SIZE bytes
+            :param adaptive_chunk: grow chunks when sending falls behind pacing and shrink them back when it keeps up
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the whole stream in seconds, default is client timeout
         """
-        validate(config, config_schema.streaming_recognition_config_schema)
+        if validate:
+            config_schema.streaming_recognition_config_validator.validate(config)
+        pacer = StreamPacer(config["config"], rps, pacing, realtime_factor)
+        sizer = ChunkSizer(config["config"], chunk_duration_ms, adaptive_chunk)
         buffer = get_buffer(source)
 
         responses = self._stub.StreamingRecognize(
-            create_stream_requests(buffer, rps, config),
-            metadata=metadata if metadata else self._metadata.metadata
+            create_stream_requests(buffer, pacer, config, sizer, owns_buffer=buffer is not source),
+            **self._call_options(metadata, timeout)
         )
 
         if with_response_meta:
             return dict_generator(responses, dict_format), responses.initial_metadata()
         return dict_generator(responses, dict_format)
 
-    def longrunning_recognize(self, source, config, dict_format=True, metadata=None, with_response_meta=False):
+    def longrunning_recognize(
+            self,
+            source,
+            config,
+            dict_format=True,
+            metadata=None,
+            with_response_meta=False,
+            validate=True,
+            timeout: float = None,
+    ):
         """
         Recognize audio in long running mode.
             :param source: uri or buffer source
             :param config: dict conforming to long_running_recognition_schema
-            :param dict_format: dict response instead of proto object
+                or result of prepare_longrunning_recognition
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
             :param metadata: configure own metadata
             :param with_response_meta: return response with metadata
-
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
         """
-        validate(config, config_schema.long_running_recognition_config_schema)
+        if validate:
+            config_schema.long_running_recognition_config_validator.validate(config)
         if self._uploader.is_storage_uri(source):
             buffer = source
         else:
             buffer = get_buffer(source)
+        try:
+            request = get_proto_longrunning_request(buffer, config)
+        finally:
+            if buffer is not source:
+                close_buffer(buffer)
 
         response, unary_obj = self._stub.LongRunningRecognize.with_call(
-            get_proto_longrunning_request(buffer, config),
-            metadata=metadata if metadata else self._metadata.metadata
+            request,
+            **self._call_options(metadata, timeout)
         )
 
         response_meta = unary_obj.initial_metadata() if with_response_meta else None
@@ -126,22 +237,27 @@ class ClientSTT(BaseClient):
             object_name: str = None,
             dict_format=True, metadata=None,
             with_response_meta=False,
+            validate=True,
+            timeout: float = None,
     ):
         """
         Recognize audio in long running mode.
             :param source: path to audio or fileobj
             :param config: dict conforming to long_running_recognition_schema
             :param object_name: name for object in storage (default: 'default_name_<utcnow>')
-            :param dict_format: dict response instead of proto object
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
             :param metadata: configure own metadata
             :param with_response_meta: return response with metadata
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
         """
-        validate(config, config_schema.long_running_recognition_config_schema)
+        if validate:
+            config_schema.long_running_recognition_config_validator.validate(config)
         uri = self._uploader.upload(source, object_name)
 
         response, unary_obj = self._stub.LongRunningRecognize.with_call(
             get_proto_longrunning_request(uri, config),
-            metadata=metadata if metadata else self._metadata.metadata
+            **self._call_options(metadata, timeout)
         )
         if with_response_meta:
             response_meta = unary_obj.initial_metadata()
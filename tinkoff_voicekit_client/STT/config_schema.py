@@ -1,3 +1,5 @@
+from tinkoff_voicekit_client.speech_utils.infrastructure import ConfigValidator
+
 definitions = {
     "StringArray": {
         "type": "array",
@@ -86,3 +88,7 @@ long_running_recognition_config_schema = {
     },
     "additionalProperties": False
 }
+
+recognition_config_validator = ConfigValidator(recognition_config_schema)
+streaming_recognition_config_validator = ConfigValidator(streaming_recognition_config_schema)
+long_running_recognition_config_validator = ConfigValidator(long_running_recognition_config_schema)
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import struct
 import time
@@ -5,7 +6,51 @@ import time
 from google.protobuf import json_format
 
 from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.stt.v1 import stt_pb2
-from tinkoff_voicekit_client.speech_utils.config_data import MAX_LENGTH, CHUNK_SIZE
+from tinkoff_voicekit_client.STT import config_schema
+from tinkoff_voicekit_client.speech_utils.infrastructure import aio_read, close_buffer, proto_cache, PreparedConfig
+from tinkoff_voicekit_client.speech_utils.config_data import (
+    MAX_LENGTH,
+    CHUNK_SIZE,
+    MIN_CHUNK_DURATION_MS,
+    MAX_CHUNK_DURATION_MS
+)
+
+SAMPLE_WIDTH = {
+    "LINEAR16": 2,
+    "ALAW": 1,
+    "MULAW": 1,
+    "LINEAR32F": 4,
+}
+
+PACING_MODES = ("rps", "audio", "none")
+
+
+def parse_recognition_config(config: dict):
+    return json_format.Parse(json.dumps(config), stt_pb2.RecognitionConfig())
+
+
+def parse_streaming_recognition_config(config: dict):
+    return json_format.Parse(json.dumps(config), stt_pb2.StreamingRecognitionConfig())
+
+
+def parse_longrunning_recognition_config(longrunning_config: dict):
+    return parse_recognition_config(longrunning_config["config"])
+
+
+def prepare_recognition_config(config: dict):
+    return PreparedConfig(config, config_schema.recognition_config_validator, parse_recognition_config)
+
+
+def prepare_streaming_recognition_config(config: dict):
+    return PreparedConfig(
+        config, config_schema.streaming_recognition_config_validator, parse_streaming_recognition_config
+    )
+
+
+def prepare_longrunning_recognition_config(config: dict):
+    return PreparedConfig(
+        config, config_schema.long_running_recognition_config_validator, parse_longrunning_recognition_config
+    )
 
 
 def get_proto_request(buffer, config: dict):
@@ -13,10 +58,9 @@ def get_proto_request(buffer, config: dict):
     if len(buffer) > MAX_LENGTH:
         raise ValueError(f"Max length of file greater than max: {MAX_LENGTH}")
 
-    grpc_config = json_format.Parse(json.dumps(config), stt_pb2.RecognitionConfig())
     grpc_request = stt_pb2.RecognizeRequest()
-    grpc_request.config.CopyFrom(grpc_config)
-    grpc_request.audio.content = buffer
+    grpc_request.config.CopyFrom(proto_cache.get(config, parse_recognition_config))
+    grpc_request.audio.content = bytes(buffer)
     return grpc_request
 
 
@@ -27,41 +71,249 @@ def get_proto_longrunning_request(source, longrunning_config: dict):
         if len(buffer) > MAX_LENGTH:
             raise ValueError(f"Max length of file greater than max: {MAX_LENGTH}")
 
-    grpc_config = json_format.Parse(json.dumps(longrunning_config["config"]), stt_pb2.RecognitionConfig())
     grpc_request = stt_pb2.LongRunningRecognizeRequest()
-    grpc_request.config.CopyFrom(grpc_config)
+    grpc_request.config.CopyFrom(proto_cache.get(longrunning_config, parse_longrunning_recognition_config))
     grpc_request.group = longrunning_config.get("group", "")
     if buffer:
-        grpc_request.audio.content = buffer
+        grpc_request.audio.content = bytes(buffer)
     else:
         grpc_request.audio.uri = source
     return grpc_request
 
 
 def get_first_stream_config(config: dict):
-    grpc_config = json_format.Parse(json.dumps(config), stt_pb2.StreamingRecognitionConfig())
-    return grpc_config
+    """
+    Return cached StreamingRecognitionConfig, copy it before modification
+    """
+    return proto_cache.get(config, parse_streaming_recognition_config)
 
 
-def create_stream_requests(buffer, rps: int, config: dict):
-    request = stt_pb2.StreamingRecognizeRequest()
-    request.streaming_config.CopyFrom(get_first_stream_config(config))
-    yield request
+def read_exactly(buffer, size: int):
+    chunks = []
+    while size > 0:
+        data = buffer.read(size)
+        if not data:
+            break
+        chunks.append(bytes(data))
+        size -= len(data)
+    return b"".join(chunks)
 
-    chunk_size = CHUNK_SIZE
-    encoding = config["config"]["encoding"]
 
+def generate_audio_chunks(buffer, encoding: str, sizer=None):
+    sizer = ChunkSizer() if sizer is None else sizer
     while True:
         if encoding == "RAW_OPUS":
-            length_bytes = buffer.read(4)
+            length_bytes = read_exactly(buffer, 4)
             if not length_bytes:
                 break
             length = struct.unpack(">I", length_bytes)[0]
-            data = buffer.read(length)
+            data = read_exactly(buffer, length)
         else:
-            data = buffer.read(chunk_size)
+            data = buffer.read(sizer.chunk_size)
             if not data:
                 break
-        request.audio_content = data
-        time.sleep(1/rps)
+        yield data
+
+
+async def aio_read_exactly(buffer, size: int):
+    chunks = []
+    while size > 0:
+        data = await aio_read(buffer, size)
+        if not data:
+            break
+        chunks.append(bytes(data))
+        size -= len(data)
+    return b"".join(chunks)
+
+
+async def aio_generate_audio_chunks(buffer, encoding: str, sizer=None):
+    """
+    Async version of generate_audio_chunks, buffer may have coroutine read
+    """
+    sizer = ChunkSizer() if sizer is None else sizer
+    while True:
+        if encoding == "RAW_OPUS":
+            length_bytes = await aio_read_exactly(buffer, 4)
+            if not length_bytes:
+                break
+            length = struct.unpack(">I", length_bytes)[0]
+            data = await aio_read_exactly(buffer, length)
+        else:
+            data = await aio_read(buffer, sizer.chunk_size)
+            if not data:
+                break
+        yield data
+
+
+def get_chunk_duration(chunk_length: int, recognition_config: dict):
+    """
+    Return duration of audio chunk in seconds or None if encoding is compressed
+        :param chunk_length: chunk length in bytes
+        :param recognition_config: dict conforming to recognition_config_schema
+    """
+    sample_width = SAMPLE_WIDTH.get(recognition_config["encoding"])
+    if sample_width is None:
+        return None
+    bytes_per_second = sample_width * recognition_config["sample_rate_hertz"] * recognition_config["num_channels"]
+    return chunk_length / bytes_per_second
+
+
+class StreamPacer:
+    """
+    Calculate delay before sending each audio chunk.
+        rps: send requests at fixed rate
+        audio: send audio at real time multiplied by realtime_factor
+        none: send audio as fast as server flow control allows
+    """
+    def __init__(self, config: dict, rps: int = 20, pacing: str = "rps", realtime_factor: float = 1.0):
+        if pacing not in PACING_MODES:
+            raise ValueError(f"Incorrect pacing: {pacing}, must be one of {PACING_MODES}")
+        if pacing == "audio":
+            if realtime_factor <= 0:
+                raise ValueError("realtime_factor must be positive")
+            if config["encoding"] not in SAMPLE_WIDTH:
+                raise ValueError(f"Audio pacing isn't supported for encoding {config['encoding']}")
+        self._config = config
+        self._rps = rps
+        self._pacing = pacing
+        self._realtime_factor = realtime_factor
+        self._start_time = None
+        self._last_time = None
+        self._audio_time = 0.0
+        self.lag = 0.0
+
+    def delay(self, chunk_length: int):
+        """
+        Return time in seconds to wait before sending chunk.
+        Also update lag: how far producer is behind schedule in seconds,
+        for rps pacing it is also behind real time of audio sent so far.
+            :param chunk_length: chunk length in bytes
+        """
+        if self._pacing == "none":
+            return 0.0
+
+        now = time.monotonic()
+        if self._start_time is None:
+            self._start_time = now
+        if self._pacing == "rps":
+            interval = 1/self._rps
+            if self._last_time is not None:
+                self.lag = max(now - self._last_time - interval, 0.0)
+            self._last_time = now
+            chunk_duration = get_chunk_duration(chunk_length, self._config)
+            if chunk_duration is not None:
+                # chunks shorter than interval fall behind real time even if requests are in time
+                self.lag = max(self.lag, now - self._start_time - self._audio_time)
+                self._audio_time += chunk_duration
+            return interval
+
+        self._audio_time += get_chunk_duration(chunk_length, self._config) / self._realtime_factor
+        scheduled_time = self._start_time + self._audio_time
+        self.lag = max(now - scheduled_time, 0.0)
+        return max(scheduled_time - now, 0.0)
+
+
+class ChunkSizer:
+    """
+    Calculate size of audio chunks in bytes.
+    By default chunks have fixed CHUNK_SIZE or size of chunk_duration_ms of audio.
+    Adaptive mode starts with chunk_duration_ms (MIN_CHUNK_DURATION_MS by default) for fast first
+    interim result, doubles chunk when producer falls behind pacing schedule or real time and
+    halves it down to MIN_CHUNK_DURATION_MS after producer keeps up for several chunks.
+    """
+    _SHRINK_AFTER_CHUNKS = 10
+
+    def __init__(self, config: dict = None, chunk_duration_ms: int = None, adaptive: bool = False):
+        if chunk_duration_ms is None and not adaptive:
+            self._frame_size = 1
+            self._base_size = self._min_size = self._max_size = CHUNK_SIZE
+        else:
+            sample_width = SAMPLE_WIDTH.get(config["encoding"])
+            if sample_width is None:
+                raise ValueError(f"Chunk size in milliseconds isn't supported for encoding {config['encoding']}")
+            self._frame_size = sample_width * config["num_channels"]
+            bytes_per_ms = self._frame_size * config["sample_rate_hertz"] / 1000
+            if chunk_duration_ms is None:
+                chunk_duration_ms = MIN_CHUNK_DURATION_MS
+            if chunk_duration_ms <= 0:
+                raise ValueError("chunk_duration_ms must be positive")
+            self._base_size = self._align(chunk_duration_ms * bytes_per_ms)
+            if adaptive:
+                self._min_size = self._align(min(chunk_duration_ms, MIN_CHUNK_DURATION_MS) * bytes_per_ms)
+                self._max_size = self._align(max(chunk_duration_ms, MAX_CHUNK_DURATION_MS) * bytes_per_ms)
+            else:
+                self._min_size = self._max_size = self._base_size
+
+        self._config = config
+        self._adaptive = adaptive
+        self._in_time_chunks = 0
+        self.chunk_size = self._base_size
+
+    def _align(self, size):
+        return max(int(size) // self._frame_size, 1) * self._frame_size
+
+    def update(self, lag: float, chunk_length: int):
+        """
+        Adapt chunk size to producer lag
+            :param lag: how far producer is behind schedule in seconds
+            :param chunk_length: length of last chunk in bytes
+        """
+        if not self._adaptive:
+            return
+        if lag > get_chunk_duration(chunk_length, self._config) / 2:
+            self._in_time_chunks = 0
+            self.chunk_size = min(self._align(self.chunk_size * 2), self._max_size)
+        elif lag == 0:
+            self._in_time_chunks += 1
+            if self._in_time_chunks >= ChunkSizer._SHRINK_AFTER_CHUNKS and self.chunk_size > self._min_size:
+                self._in_time_chunks = 0
+                self.chunk_size = max(self._align(self.chunk_size // 2), self._min_size)
+
+
+def create_stream_requests(
+        buffer, pacer: StreamPacer, config: dict, sizer: ChunkSizer = None, owns_buffer: bool = False
+):
+    """
+    Generate streaming requests: config and then audio chunks of buffer.
+    If owns_buffer is set, buffer is closed when generator finishes.
+    """
+    try:
+        request = stt_pb2.StreamingRecognizeRequest()
+        request.streaming_config.CopyFrom(get_first_stream_config(config))
         yield request
+
+        sizer = ChunkSizer() if sizer is None else sizer
+        for data in generate_audio_chunks(buffer, config["config"]["encoding"], sizer):
+            request.audio_content = bytes(data)
+            delay = pacer.delay(len(data))
+            sizer.update(pacer.lag, len(data))
+            if delay:
+                time.sleep(delay)
+            yield request
+    finally:
+        if owns_buffer:
+            close_buffer(buffer)
+
+
+async def aio_create_stream_requests(
+        buffer, pacer: StreamPacer, config: dict, sizer: ChunkSizer = None, owns_buffer: bool = False
+):
+    """
+    Async version of create_stream_requests for grpc.aio.
+    Pacing is done with asyncio.sleep, so streams don't block the event loop.
+    """
+    try:
+        request = stt_pb2.StreamingRecognizeRequest()
+        request.streaming_config.CopyFrom(get_first_stream_config(config))
+        yield request
+
+        sizer = ChunkSizer() if sizer is None else sizer
+        async for data in aio_generate_audio_chunks(buffer, config["config"]["encoding"], sizer):
+            request.audio_content = bytes(data)
+            delay = pacer.delay(len(data))
+            sizer.update(pacer.lag, len(data))
+            await asyncio.sleep(delay)
+            yield request
+    finally:
+        if owns_buffer:
+            close_buffer(buffer)
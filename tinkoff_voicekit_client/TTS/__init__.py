@@ -1,2 +1,3 @@
 from tinkoff_voicekit_client.TTS.client_tts import ClientTTS
+from tinkoff_voicekit_client.TTS.synthesis_cache import SynthesisCache
 from tinkoff_voicekit_client.TTS import aio_client_tts as aio
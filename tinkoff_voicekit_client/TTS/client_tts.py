@@ -1,17 +1,27 @@
+import collections
+import itertools
 import os
-
-from jsonschema import validate
+from concurrent.futures import ThreadPoolExecutor
 
 from tinkoff_voicekit_client.TTS import config_schema
 from tinkoff_voicekit_client.TTS.configurator_codec import configuration
+from tinkoff_voicekit_client.TTS.synthesis_cache import SynthesisCache, get_request_key
 from tinkoff_voicekit_client.TTS.helper_tts import (
     get_utterance_generator,
+    get_synthesis_input,
+    get_voice_names,
     get_proto_synthesize_request,
-    get_encoder, save_synthesize_wav
+    get_utterance_request,
+    write_synthesis_wav,
+    prepare_synthesis_config,
+    VoicesCache
 )
 from tinkoff_voicekit_client.speech_utils.BaseClient.base_client import BaseClient
+from tinkoff_voicekit_client.speech_utils.BaseClient.channel_options import ChannelOptions
 from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.tts.v1.tts_pb2_grpc import TextToSpeechStub
-from tinkoff_voicekit_client.speech_utils.config_data import client_config, aud
+from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.tts.v1 import tts_pb2
+from tinkoff_voicekit_client.speech_utils.config_data import client_config, aud, VOICES_TTL
+from tinkoff_voicekit_client.speech_utils.infrastructure import response_format
 from tinkoff_voicekit_client.speech_utils.metadata import Metadata
 
 
@@ -23,7 +33,16 @@ class ClientTTS(BaseClient):
             host: str = client_config["host_tts"],
             port: int = client_config["port"],
             ssl_channel: bool = True,
-            ca_file: str = None
+            ca_file: str = None,
+            shared_channel: bool = True,
+            channels_count: int = 1,
+            channel_options: ChannelOptions = None,
+            timeout: float = None,
+            auth_plugin: bool = True,
+            interceptors: list = None,
+            metrics=None,
+            voices_ttl: float = VOICES_TTL,
+            synthesis_cache: SynthesisCache = None,
     ):
         """
         Create client for speech synthesis.
@@ -32,11 +51,123 @@ class ClientTTS(BaseClient):
             :param host: Tinkoff Voicekit speech synthesize host url
             :param port: Tinkoff Voicekit speech synthesize port, default value: 443
             :param ca_file: optional certificate file
+            :param shared_channel: share grpc channel with other clients with the same host and options
+            :param channels_count: number of grpc channels (connections), new call goes to the least loaded one
+            :param channel_options: ChannelOptions (or list of raw grpc options) tuning keepalive, flow control,
+                message sizes and compression of grpc channel
+            :param timeout: default deadline of every call in seconds, no deadline by default
+            :param auth_plugin: attach authorization by grpc call credentials on ssl channel
+                instead of passing metadata to every call
+            :param interceptors: list of grpc client interceptors, e.g. from speech_utils.BaseClient.interceptors
+            :param metrics: collect metrics of every call, e.g. speech_utils.BaseClient.metrics.PrometheusMetrics
+                or speech_utils.BaseClient.interceptors.CallMetrics
+            :param voices_ttl: seconds to keep result of list_voices
+            :param synthesis_cache: SynthesisCache, repeated synthesize calls return cached audio without request
         """
-        super().__init__(host, port, ssl_channel, ca_file)
+        super().__init__(
+            host,
+            port,
+            ssl_channel,
+            ca_file,
+            options=channel_options,
+            shared_channel=shared_channel,
+            channels_count=channels_count,
+            timeout=timeout,
+            auth_plugin=auth_plugin,
+            interceptors=interceptors,
+            metrics=metrics,
+        )
         configuration()
         self._metadata = Metadata(api_key, secret_key, aud=aud["tts"])
-        self._stub = TextToSpeechStub(self._channel)
+        self._stub = self._make_stub(TextToSpeechStub)
+        self._voices = VoicesCache(voices_ttl)
+        self._synthesis_cache = synthesis_cache
+
+    def prepare_synthesis(self, config: dict):
+        """
+        Validate config and build proto request once for streaming_synthesize calls.
+            :param config: dict conforming to streaming_synthesize_config_schema
+        """
+        return prepare_synthesis_config(config)
+
+    def synthesize(
+            self,
+            text: str,
+            config: dict,
+            ssml: bool = False,
+            with_response_meta=False,
+            metadata=None,
+            validate=True,
+            timeout: float = None,
+    ):
+        """
+        Description:
+        Synthesize short text by one call and return whole audio in encoding of config.
+        Audio is taken from synthesis cache of client if any, then response metadata is None.
+            :param text: text or ssml to synthesize
+            :param config: dict conforming to streaming_synthesize_config_schema or result of prepare_synthesis
+            :param ssml: enable ssml
+            :param with_response_meta: return audio with metadata
+            :param metadata: configure own metadata
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of the call in seconds, default is client timeout
+        """
+        if validate:
+            config_schema.streaming_synthesize_config_validator.validate(config)
+        request = get_utterance_request(get_proto_synthesize_request(config), get_synthesis_input(text, ssml))
+        cache_key = None
+        if self._synthesis_cache is not None:
+            cache_key = get_request_key(request)
+            audio = self._synthesis_cache.get(cache_key)
+            if audio is not None:
+                return (audio, None) if with_response_meta else audio
+
+        response, call = self._stub.Synthesize.with_call(request, **self._call_options(metadata, timeout))
+        response_meta = call.initial_metadata() if with_response_meta else None
+        if cache_key is not None:
+            self._synthesis_cache.put(cache_key, response.audio_content)
+        if with_response_meta:
+            return response.audio_content, response_meta
+        return response.audio_content
+
+    def list_voices(
+            self,
+            language_code: str = "",
+            metadata=None,
+            dict_format=True,
+            refresh=False,
+            timeout: float = None,
+    ):
+        """
+        Description:
+        Return available voices, result is cached by client for voices_ttl seconds.
+            :param language_code: return only voices of language, e.g. "ru-RU", all voices by default
+            :param metadata: configure own metadata
+            :param dict_format: dict response instead of proto object, "lazy" - read-only dict view of proto object
+            :param refresh: call ListVoices even if cached result isn't expired
+            :param timeout: deadline of the call in seconds, default is client timeout
+        """
+        voices = None if refresh else self._voices.get(language_code)
+        if voices is None:
+            request = tts_pb2.ListVoicesRequest(language_code=language_code)
+            voices = self._stub.ListVoices(request, **self._call_options(metadata, timeout))
+            self._voices.put(language_code, voices)
+        return response_format(voices, dict_format)
+
+    def check_voice(self, config: dict, metadata=None, timeout: float = None):
+        """
+        Description:
+        Raise ValueError if voice of config isn't in cached result of list_voices.
+            :param config: dict conforming to streaming_synthesize_config_schema or result of prepare_synthesis
+            :param metadata: configure own metadata
+            :param timeout: deadline of ListVoices call in seconds, default is client timeout
+        """
+        name = config.get("voice", {}).get("name")
+        if name is None:
+            return
+        voices = self.list_voices(metadata=metadata, dict_format=False, timeout=timeout)
+        if name not in get_voice_names(voices):
+            raise ValueError("Unknown voice: {0}".format(name))
 
     def streaming_synthesize(
             self,
@@ -45,31 +176,44 @@ class ClientTTS(BaseClient):
             ssml: bool = False,
             text_encoding: str = "utf-8",
             with_response_meta=False,
-            metadata=None
+            metadata=None,
+            validate=True,
+            timeout: float = None,
+            concurrency: int = 1,
     ):
         """
         Description:
         return generator by StreamingSynthesizeSpeechResponses from each text line in file or text string.
             :param text_source: path to file with text or string with text
-            :param config: dict conforming to streaming_synthesize_config_schema
+            :param config: dict conforming to streaming_synthesize_config_schema or result of prepare_synthesis
             :param ssml: enable ssml
             :param text_encoding: text encoding
             :param with_response_meta: return response with metadata
             :param metadata: configure own metadata
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of stream of each text line in seconds, default is client timeout
+            :param concurrency: number of text lines synthesized ahead, responses are still returned in text order
         """
-        validate(config, config_schema.streaming_synthesize_config_schema)
-        request = get_proto_synthesize_request(config)
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        if validate:
+            config_schema.streaming_synthesize_config_validator.validate(config)
+        template = get_proto_synthesize_request(config)
 
+        calls = collections.deque()
         utterances = get_utterance_generator(text_source, text_encoding, ssml)
         for synthesis_input in utterances:
-            request.input.CopyFrom(synthesis_input)
-            response = self._stub.StreamingSynthesize(
-                request, metadata=metadata if metadata else self._metadata.metadata
-            )
-            if with_response_meta:
-                yield response, response.initial_metadata()
-            else:
-                yield response
+            calls.append(self._stub.StreamingSynthesize(
+                get_utterance_request(template, synthesis_input), **self._call_options(metadata, timeout)
+            ))
+            if len(calls) == concurrency:
+                yield self._row_response(calls.popleft(), with_response_meta)
+        while calls:
+            yield self._row_response(calls.popleft(), with_response_meta)
+
+    @staticmethod
+    def _row_response(response, with_response_meta):
+        return (response, response.initial_metadata()) if with_response_meta else response
 
     def synthesize_to_audio_wav(
             self,
@@ -80,33 +224,49 @@ class ClientTTS(BaseClient):
             output_dir: str = os.curdir,
             text_encoding: str = "utf-8",
             with_response_meta=False,
-            metadata=None
+            metadata=None,
+            validate=True,
+            timeout: float = None,
+            concurrency: int = 1,
     ):
         """
         Description:
         Generate audio for each text line from your text source and save it in wav format.
             :param text_source: path to file with text or string with text
-            :param config: dict conforming to streaming_synthesize_config_schema
+            :param config: dict conforming to streaming_synthesize_config_schema or result of prepare_synthesis
             :param file_name: name of synthesis audio file
             :param ssml: enable ssml
             :param output_dir: path to output directory where to store synthesized audio
             :param text_encoding: text encoding
             :param with_response_meta: return metadata of last row
             :param metadata: configure own metadata
+            :param validate: validate config by json schema, disable it only for trusted configs
+            :param timeout: deadline of stream of each text line in seconds, default is client timeout
+            :param concurrency: number of text lines synthesized in parallel threads
         """
-        rows_responses = self.streaming_synthesize(text_source, config, ssml, text_encoding, metadata)
-        get_chunk = get_encoder(config["audio_encoding"], config["sample_rate_hertz"])
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        rows_responses = self.streaming_synthesize(
+            text_source, config, ssml, text_encoding, metadata=metadata, validate=validate, timeout=timeout
+        )
         os.makedirs(output_dir, exist_ok=True)
+        encoding, rate = config["audio_encoding"], config["sample_rate_hertz"]
 
-        response_meta = None
-        for index, row_response in enumerate(rows_responses):
-            response_meta = row_response.initial_metadata()
-
-            audio_chunks = []
-            for response in row_response:
-                audio_chunks += get_chunk(response.audio_chunk)
-
-            save_synthesize_wav(bytes(audio_chunks),
-                                os.path.join(output_dir, f"{file_name}_{index}.wav"),
-                                config["sample_rate_hertz"])
-        return response_meta if with_response_meta else None
+        row_response = None
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = collections.deque()
+            for index in itertools.count():
+                # next row starts its call, so slot is freed before it
+                if len(pending) == concurrency:
+                    pending.popleft().result()
+                next_response = next(rows_responses, None)
+                if next_response is None:
+                    break
+                row_response = next_response
+                file_path = os.path.join(output_dir, f"{file_name}_{index}.wav")
+                pending.append(executor.submit(write_synthesis_wav, row_response, file_path, encoding, rate))
+            for future in pending:
+                future.result()
+        if with_response_meta and row_response is not None:
+            return row_response.initial_metadata()
+        return None
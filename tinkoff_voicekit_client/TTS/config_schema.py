@@ -1,3 +1,5 @@
+from tinkoff_voicekit_client.speech_utils.infrastructure import ConfigValidator
+
 definitions = {
     "AudioEncoding": {
         "type": "string",
@@ -52,3 +54,5 @@ streaming_synthesize_config_schema = {
     ],
     "additionalProperties": False
 }
+
+streaming_synthesize_config_validator = ConfigValidator(streaming_synthesize_config_schema)
@@ -1,19 +1,119 @@
 import json
 import os
-import wave
+import struct
+import threading
+import time
 from google.protobuf import json_format
 from tinkoff_voicekit_client.speech_utils.apis.tinkoff.cloud.tts.v1 import tts_pb2
+from tinkoff_voicekit_client.TTS import config_schema
+from tinkoff_voicekit_client.speech_utils.infrastructure import proto_cache, PreparedConfig
 
 
 def get_encoder(encoding: str, rate: int):
+    """
+    Return function converting audio chunk of synthesis response to LINEAR16 PCM bytes
+        :param encoding: audio encoding of synthesis
+        :param rate: sample rate of synthesis
+    """
     if encoding == "LINEAR16":
-        return lambda audio_chunk: list(map(lambda x: int(x), audio_chunk))
+        return lambda audio_chunk: audio_chunk
     elif encoding == "RAW_OPUS":
         from opuslib import Decoder
         decode = Decoder(rate, channels=1).decode
-        return lambda audio_chunk: list(map(lambda x: int(x), decode(audio_chunk, frame_size=int(0.12 * rate))))
+        frame_size = int(0.12 * rate)
+        return lambda audio_chunk: decode(audio_chunk, frame_size=frame_size)
     else:
-        raise NotImplemented("Another encoding is not supported")
+        raise NotImplementedError("Another encoding is not supported")
+
+
+def pcm_to_array(audio_content):
+    """
+    Return numpy int16 array of LINEAR16 audio without copying, numpy is optional dependency
+        :param audio_content: bytes-like LINEAR16 audio
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("pcm_to_array requires numpy: pip install tinkoff-voicekit-client[numpy]") from None
+    return numpy.frombuffer(audio_content, dtype="<i2")
+
+
+class WavWriter:
+    """
+    Incremental writer of LINEAR16 wav, frames are written as they arrive and RIFF header is patched at close.
+    Header of not seekable file-like keeps max sizes as for endless stream.
+    """
+    _HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+    _UNKNOWN_SIZE = 0xFFFFFFFF
+
+    def __init__(self, target, rate: int, channels: int = 1, sample_width: int = 2):
+        """
+        Create wav writer and write header.
+            :param target: path to wav file or writable binary file-like object
+            :param rate: sample rate
+            :param channels: number of channels
+            :param sample_width: bytes per sample
+        """
+        if isinstance(target, (str, os.PathLike)):
+            self._file = open(target, "wb")
+            self._own_file = True
+        else:
+            self._file = target
+            self._own_file = False
+        self._rate = rate
+        self._channels = channels
+        self._sample_width = sample_width
+        self._data_length = 0
+        self._closed = False
+        self._seekable = getattr(self._file, "seekable", lambda: False)()
+        self._start = self._file.tell() if self._seekable else 0
+        self._write_header(None)
+
+    def _write_header(self, data_length):
+        riff_size = self._UNKNOWN_SIZE if data_length is None else min(36 + data_length, self._UNKNOWN_SIZE)
+        data_size = self._UNKNOWN_SIZE if data_length is None else min(data_length, self._UNKNOWN_SIZE)
+        block_align = self._channels * self._sample_width
+        self._file.write(self._HEADER.pack(
+            b"RIFF", riff_size, b"WAVE",
+            b"fmt ", 16, 1, self._channels, self._rate, self._rate * block_align, block_align, self._sample_width * 8,
+            b"data", data_size
+        ))
+
+    @property
+    def data_length(self):
+        return self._data_length
+
+    def write(self, frames):
+        """
+        Append frames to wav
+            :param frames: bytes-like LINEAR16 audio
+        """
+        self._file.write(frames)
+        self._data_length += memoryview(frames).nbytes
+
+    def close(self):
+        """
+        Patch header with written data size and close file opened by writer
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._seekable:
+                end = self._file.tell()
+                self._file.seek(self._start)
+                self._write_header(self._data_length)
+                self._file.seek(end)
+            self._file.flush()
+        finally:
+            if self._own_file:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
 def save_synthesize_wav(
@@ -22,15 +122,39 @@ def save_synthesize_wav(
         rate: int,
         channels: int = 1
 ):
-    with wave.open(file_name, "wb") as wav_out:
-        wav_out.setnframes(len(audio_content))
-        wav_out.setframerate(rate)
-        wav_out.setnchannels(channels)
-        wav_out.setsampwidth(2)
-        wav_out.writeframes(audio_content)
+    with WavWriter(file_name, rate, channels) as wav_out:
+        wav_out.write(audio_content)
 
 
-def get_proto_synthesize_request(config: dict):
+def write_synthesis_wav(responses, target, encoding: str, rate: int):
+    """
+    Write audio of streaming synthesis responses of one utterance to wav
+        :param responses: iterator of StreamingSynthesizeSpeechResponse
+        :param target: path to wav file or writable binary file-like object
+        :param encoding: audio encoding of synthesis
+        :param rate: sample rate of synthesis
+    """
+    get_chunk = get_encoder(encoding, rate)
+    with WavWriter(target, rate) as wav_out:
+        for response in responses:
+            wav_out.write(get_chunk(response.audio_chunk))
+
+
+async def aio_write_synthesis_wav(responses, target, encoding: str, rate: int):
+    """
+    Write audio of async streaming synthesis responses of one utterance to wav
+        :param responses: async iterator of StreamingSynthesizeSpeechResponse
+        :param target: path to wav file or writable binary file-like object
+        :param encoding: audio encoding of synthesis
+        :param rate: sample rate of synthesis
+    """
+    get_chunk = get_encoder(encoding, rate)
+    with WavWriter(target, rate) as wav_out:
+        async for response in responses:
+            wav_out.write(get_chunk(response.audio_chunk))
+
+
+def build_synthesize_request(config: dict):
     grpc_request = tts_pb2.SynthesizeSpeechRequest()
     grpc_request.audio_config.audio_encoding = tts_pb2.AudioEncoding.Value(config.get("audio_encoding", 0))
     grpc_request.audio_config.speaking_rate = config.get("speaking_rate", 0)
@@ -41,18 +165,79 @@ def get_proto_synthesize_request(config: dict):
     return grpc_request
 
 
+def prepare_synthesis_config(config: dict):
+    return PreparedConfig(config, config_schema.streaming_synthesize_config_validator, build_synthesize_request)
+
+
+def get_proto_synthesize_request(config: dict):
+    grpc_request = tts_pb2.SynthesizeSpeechRequest()
+    grpc_request.CopyFrom(proto_cache.get(config, build_synthesize_request))
+    return grpc_request
+
+
+def get_utterance_request(template, synthesis_input):
+    """
+    Return new request for utterance, request can't be reused while call with it may be in flight
+        :param template: SynthesizeSpeechRequest with voice and audio config
+        :param synthesis_input: SynthesisInput of utterance
+    """
+    request = tts_pb2.SynthesizeSpeechRequest()
+    request.CopyFrom(template)
+    request.input.CopyFrom(synthesis_input)
+    return request
+
+
 def get_utterance_generator(text_source, text_encoding: str, enable_ssml: bool):
     if os.path.isfile(text_source):
         utterances_generator = generate_file_utterances
     else:
         utterances_generator = generate_text_utterances
     for text in utterances_generator(text_source, text_encoding):
-        synthesis_input = tts_pb2.SynthesisInput()
-        if enable_ssml:
-            synthesis_input.ssml = text
-        else:
-            synthesis_input.text = text
-        yield synthesis_input
+        yield get_synthesis_input(text, enable_ssml)
+
+
+def get_synthesis_input(text, enable_ssml: bool):
+    synthesis_input = tts_pb2.SynthesisInput()
+    if enable_ssml:
+        synthesis_input.ssml = text
+    else:
+        synthesis_input.text = text
+    return synthesis_input
+
+
+def get_voice_names(voices):
+    """
+    Return set of voice names of ListVoices response
+        :param voices: ListVoicesResponses
+    """
+    return {voice.name for voice in voices.voices}
+
+
+class VoicesCache:
+    """
+    Thread-safe cache of ListVoices responses by language code, responses expire after ttl seconds.
+    Responses are shared between calls, don't modify them.
+    """
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._voices = {}
+        self._lock = threading.Lock()
+
+    def get(self, language_code: str):
+        """
+        Return cached response or None if there is no fresh one
+        """
+        with self._lock:
+            voices, expiration_time = self._voices.get(language_code, (None, 0))
+        return voices if time.monotonic() < expiration_time else None
+
+    def put(self, language_code: str, voices):
+        with self._lock:
+            self._voices[language_code] = (voices, time.monotonic() + self._ttl)
+
+    def clear(self):
+        with self._lock:
+            self._voices.clear()
 
 
 def generate_utterance(line: str):
@@ -0,0 +1,248 @@
+"""
+Content-addressed cache of synthesized audio for repeated prompts.
+Audio is keyed by hash of SynthesizeSpeechRequest which is sent to server,
+so text or ssml, voice, audio encoding, sample rate and speaking rate are all part of the key.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+MEMORY_ITEMS = 1024
+DISK_SIZE = 1024 * 2**20
+
+
+def get_request_key(request):
+    """
+    Return hex sha256 of deterministic serialization of SynthesizeSpeechRequest
+        :param request: SynthesizeSpeechRequest
+    """
+    return hashlib.sha256(request.SerializeToString(deterministic=True)).hexdigest()
+
+
+class SynthesisCache:
+    """
+    Thread-safe two-tier cache of synthesized audio: in-memory LRU by number of items
+    and optional on-disk tier evicting least recently used files when its size is exceeded.
+    Directory is scanned on first access of disk tier, aio_get and aio_put do disk i/o in executor.
+    Pass it to ClientTTS by synthesis_cache parameter.
+    """
+
+    def __init__(self, memory_items: int = MEMORY_ITEMS, directory: str = None, disk_size: int = DISK_SIZE):
+        """
+        Create cache.
+            :param memory_items: max number of audios in memory, 0 disables memory tier
+            :param directory: directory of on-disk tier, it is created if missing, no disk tier by default
+            :param disk_size: max size of audio files in directory in bytes
+        """
+        if memory_items < 0:
+            raise ValueError("memory_items must not be negative")
+        if disk_size < 0:
+            raise ValueError("disk_size must not be negative")
+        self._memory_items = memory_items
+        self._memory = OrderedDict()
+        self._directory = directory
+        self._disk_size = disk_size
+        self._disk = OrderedDict()
+        self._disk_used = 0
+        self._disk_loaded = directory is None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _load_disk(self):
+        # called under lock, files over disk_size left by previous runs are evicted
+        if self._disk_loaded:
+            return
+        self._disk_loaded = True
+        os.makedirs(self._directory, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self._directory):
+            if entry.is_file() and entry.name.endswith(".audio"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-len(".audio")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_used += size
+        self._remove_files(self._evict_disk())
+
+    def _evict_disk(self):
+        evicted = []
+        while self._disk_used > self._disk_size:
+            key, size = self._disk.popitem(last=False)
+            self._disk_used -= size
+            evicted.append(key)
+        return evicted
+
+    def _remove_files(self, keys):
+        for key in keys:
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key: str):
+        return os.path.join(self._directory, key + ".audio")
+
+    @property
+    def hits(self):
+        return self.memory_hits + self.disk_hits
+
+    def stats(self):
+        """
+        Return dict with hits, misses and current size of tiers
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_items": len(self._memory),
+                "disk_items": len(self._disk),
+                "disk_size": self._disk_used,
+            }
+
+    def get(self, key: str):
+        """
+        Return cached audio or None, audio found on disk is moved to memory tier
+            :param key: result of get_request_key
+        """
+        audio = self.get_memory(key)
+        return self.get_disk(key) if audio is None else audio
+
+    async def aio_get(self, key: str):
+        """
+        Like get, memory tier is checked inline and disk tier in default executor of event loop
+            :param key: result of get_request_key
+        """
+        audio = self.get_memory(key)
+        if audio is not None:
+            return audio
+        if self._directory is None:
+            # only counts miss
+            return self.get_disk(key)
+        return await asyncio.get_event_loop().run_in_executor(None, self.get_disk, key)
+
+    def get_memory(self, key: str):
+        """
+        Return audio of memory tier or None, miss isn't counted as it may be found on disk
+            :param key: result of get_request_key
+        """
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return audio
+
+    def get_disk(self, key: str):
+        """
+        Return audio of disk tier and move it to memory tier or count miss and return None
+            :param key: result of get_request_key
+        """
+        with self._lock:
+            self._load_disk()
+            on_disk = key in self._disk
+            if on_disk:
+                self._disk.move_to_end(key)
+
+        audio = self._read(key) if on_disk else None
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._put_memory(key, audio)
+        return audio
+
+    def _read(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # file is evicted by another thread or removed outside
+            with self._lock:
+                self._disk_used -= self._disk.pop(key, 0)
+            return None
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        """
+        Store audio in both tiers
+            :param key: result of get_request_key
+            :param audio: synthesized audio
+        """
+        audio = bytes(audio)
+        with self._lock:
+            self._put_memory(key, audio)
+        self.put_disk(key, audio)
+
+    async def aio_put(self, key: str, audio: bytes):
+        """
+        Like put, audio is written to disk tier in default executor of event loop
+            :param key: result of get_request_key
+            :param audio: synthesized audio
+        """
+        audio = bytes(audio)
+        with self._lock:
+            self._put_memory(key, audio)
+        if self._directory is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self.put_disk, key, audio)
+
+    def put_disk(self, key: str, audio: bytes):
+        """
+        Store audio in disk tier if any
+            :param key: result of get_request_key
+            :param audio: synthesized audio
+        """
+        if self._directory is None or len(audio) > self._disk_size:
+            return
+        with self._lock:
+            self._load_disk()
+            if key in self._disk:
+                return
+        self._write(key, audio)
+
+    def _put_memory(self, key: str, audio: bytes):
+        if self._memory_items == 0:
+            return
+        self._memory[key] = audio
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+
+    def _write(self, key: str, audio: bytes):
+        # write to temporary file and rename it to never expose partial audio
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        with self._lock:
+            self._disk_used += len(audio) - self._disk.get(key, 0)
+            self._disk[key] = len(audio)
+            evicted = self._evict_disk()
+        self._remove_files(evicted)
+
+    def clear(self):
+        """
+        Remove all audio of both tiers
+        """
+        with self._lock:
+            if self._directory is not None:
+                self._load_disk()
+            keys = list(self._disk)
+            self._memory.clear()
+            self._disk.clear()
+            self._disk_used = 0
+        self._remove_files(keys)
@@ -1,6 +1,7 @@
 from tinkoff_voicekit_client.STT import ClientSTT
-from tinkoff_voicekit_client.TTS import ClientTTS
+from tinkoff_voicekit_client.TTS import ClientTTS, SynthesisCache
 from tinkoff_voicekit_client.Operations import ClientOperations
 from tinkoff_voicekit_client.Uploader.uploader import Uploader
+from tinkoff_voicekit_client.speech_utils.BaseClient.channel_options import ChannelOptions
 from tinkoff_voicekit_client.speech_utils import user_utils
 from tinkoff_voicekit_client import aio_voicekit
@@ -1,22 +1,116 @@
+import asyncio
+
 import grpc
 
 from tinkoff_voicekit_client.speech_utils.BaseClient.base_client import AbstractBaseClient
+from tinkoff_voicekit_client.speech_utils.BaseClient.aio_interceptors import MetricsInterceptor, channel_interceptors
+from tinkoff_voicekit_client.speech_utils.BaseClient.channel_pool import ChannelPool
 
 
 class BaseClient(AbstractBaseClient):
     """
     This class provide base methods for STT, TTS, Operations
     """
-    def __init__(self, host, port, ssl_channel=False, ca_file=None, options: list = None):
-        super().__init__(host, port, ssl_channel, ca_file, options)
+    _channel_pool = ChannelPool()
+    _metrics_interceptor = MetricsInterceptor
+
+    def __init__(
+            self,
+            host,
+            port,
+            ssl_channel=False,
+            ca_file=None,
+            options=None,
+            shared_channel: bool = True,
+            channels_count: int = 1,
+            timeout: float = None,
+            auth_plugin: bool = True,
+            interceptors: list = None,
+            metrics=None,
+    ):
+        super().__init__(
+            host, port, ssl_channel, ca_file, options, shared_channel, channels_count,
+            timeout, auth_plugin, interceptors, metrics
+        )
+        self._close_expired()
+
+    @staticmethod
+    def _get_running_loop():
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _channel_key(self, index: int):
+        # aio channel is bound to event loop
+        return super()._channel_key(index) + (self._get_running_loop(),)
+
+    @classmethod
+    def _close_expired(cls):
+        """
+        Drop channels of closed event loops and close expired idle channels of running loop,
+        return seconds until the next idle channel of running loop expires or None
+        """
+        # channel of closed loop can't be closed, its entry is only removed to free it
+        cls._channel_pool.prune(lambda key: key[-1] is not None and key[-1].is_closed())
+        loop = cls._get_running_loop()
+        if loop is None:
+            return
+        def of_loop(key):
+            return key[-1] is loop or key[-1] is None
+
+        for channel in cls._channel_pool.pop_expired(of_loop):
+            if channel.close_when_idle():
+                loop.create_task(channel.close())
+        return cls._channel_pool.time_to_expire(of_loop)
+
+    @classmethod
+    def _schedule_close_expired(cls, delay: float):
+        def close_expired():
+            next_delay = cls._close_expired()
+            if next_delay is not None:
+                cls._schedule_close_expired(next_delay)
+
+        asyncio.get_running_loop().call_later(delay, close_expired)
+
+    @staticmethod
+    def _close_later(channel):
+        # done callbacks of aio calls run in event loop of channel
+        asyncio.ensure_future(channel.close())
 
     def _make_channel(self):
         target = "{}:{}".format(self._host, self._port)
+        interceptors = channel_interceptors(self._interceptors)
         if self._ssl_channel:
             creds = self._get_credential()
-            return grpc.aio.secure_channel(target, creds, options=self._options)
+            return grpc.aio.secure_channel(
+                target, creds, options=self._options, compression=self._compression, interceptors=interceptors
+            )
         else:
-            return grpc.aio.insecure_channel(target, options=self._options)
+            return grpc.aio.insecure_channel(
+                target, options=self._options, compression=self._compression, interceptors=interceptors
+            )
 
     async def close(self):
-        await self._channel.close()
+        """
+        Release client channels, channel is closed when no client uses it and its calls are done
+        """
+        for channel in self._release_channels():
+            if channel.close_when_idle():
+                await channel.close()
+        if self._shared_channel:
+            # channels which became idle are closed when they expire, unless new client takes them
+            self._schedule_close_expired(self._channel_pool.idle_timeout)
+
+    async def warm_up(self, timeout: float = None, refresh_jwt: bool = True):
+        """
+        Establish connections of all client channels and sign authorization token before first request.
+        Raise asyncio.TimeoutError if channels aren't ready in time.
+            :param timeout: max time in seconds to wait for channels, wait forever by default
+            :param refresh_jwt: sign new authorization token
+        """
+        await asyncio.wait_for(
+            asyncio.gather(*(channel.channel_ready() for channel in self._channels)),
+            timeout
+        )
+        self._prepare_metadata(refresh_jwt)
@@ -0,0 +1,236 @@
+"""
+Client interceptors for aio clients, pass them to client constructor by interceptors parameter.
+grpc.aio channel uses each interceptor object for one type of calls only,
+so interceptors of all call types are passed to grpc.aio channels through channel_interceptors.
+"""
+import asyncio
+import time
+
+import grpc
+
+from tinkoff_voicekit_client.speech_utils.BaseClient.interceptors import (
+    CallMetrics,
+    ResponseObserver,
+    RetryPolicy,
+    method_name
+)
+
+
+async def _observed_responses(call, observer: ResponseObserver):
+    async for response in call:
+        observer(response)
+        yield response
+
+
+class _UnaryUnaryInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    def __init__(self, interceptor):
+        self._interceptor = interceptor
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        return await self._interceptor.intercept_unary_unary(continuation, client_call_details, request)
+
+
+class _UnaryStreamInterceptor(grpc.aio.UnaryStreamClientInterceptor):
+    def __init__(self, interceptor):
+        self._interceptor = interceptor
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        return await self._interceptor.intercept_unary_stream(continuation, client_call_details, request)
+
+
+class _StreamUnaryInterceptor(grpc.aio.StreamUnaryClientInterceptor):
+    def __init__(self, interceptor):
+        self._interceptor = interceptor
+
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        return await self._interceptor.intercept_stream_unary(continuation, client_call_details, request_iterator)
+
+
+class _StreamStreamInterceptor(grpc.aio.StreamStreamClientInterceptor):
+    def __init__(self, interceptor):
+        self._interceptor = interceptor
+
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        return await self._interceptor.intercept_stream_stream(continuation, client_call_details, request_iterator)
+
+
+class _CallInterceptor:
+    """
+    Base interceptor observing start and end of calls of all types
+    """
+
+    def channel_interceptors(self):
+        """
+        Return grpc.aio interceptors of each call type
+        """
+        return [
+            _UnaryUnaryInterceptor(self),
+            _UnaryStreamInterceptor(self),
+            _StreamUnaryInterceptor(self),
+            _StreamStreamInterceptor(self),
+        ]
+
+    def _call_started(self, method: str):
+        pass
+
+    def _call_finished(self, method: str, code: grpc.StatusCode, duration: float):
+        pass
+
+    async def _report(self, method: str, call, start: float):
+        duration = time.monotonic() - start
+        self._call_finished(method, await call.code(), duration)
+
+    async def _intercept(self, continuation, client_call_details, request):
+        method = method_name(client_call_details)
+        start = time.monotonic()
+        self._call_started(method)
+        try:
+            call = await continuation(client_call_details, request)
+        except Exception:
+            self._call_finished(method, grpc.StatusCode.UNKNOWN, time.monotonic() - start)
+            raise
+        # code of aio call is awaitable, it is ready when done callback is called
+        call.add_done_callback(lambda done: asyncio.ensure_future(self._report(method, done, start)))
+        return call
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        return await self._intercept(continuation, client_call_details, request)
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        return await self._intercept(continuation, client_call_details, request)
+
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        return await self._intercept(continuation, client_call_details, request_iterator)
+
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        return await self._intercept(continuation, client_call_details, request_iterator)
+
+
+def channel_interceptors(interceptors):
+    """
+    Return list of interceptors for grpc.aio channel, interceptors of this module are expanded for all call types
+        :param interceptors: list of interceptors of this module or grpc.aio interceptors
+    """
+    result = []
+    for interceptor in interceptors:
+        if isinstance(interceptor, _CallInterceptor):
+            result.extend(interceptor.channel_interceptors())
+        else:
+            result.append(interceptor)
+    return result
+
+
+class TimingInterceptor(_CallInterceptor):
+    """
+    Measure latency of every call, streaming calls are measured until the end of stream
+    """
+
+    def __init__(self, callback):
+        """
+        Create timing interceptor.
+            :param callback: function called with method name, duration in seconds and status code of finished call
+        """
+        self._callback = callback
+
+    def _call_finished(self, method: str, code: grpc.StatusCode, duration: float):
+        self._callback(method, duration, code)
+
+
+class MetricsInterceptor(_CallInterceptor):
+    """
+    Collect calls in flight, status codes, latency and bytes of every call,
+    time to first response and to first final result of streams
+    """
+
+    def __init__(self, metrics=None):
+        """
+        Create metrics interceptor.
+            :param metrics: object with methods of CallMetrics, e.g. PrometheusMetrics, CallMetrics by default
+        """
+        self.metrics = CallMetrics() if metrics is None else metrics
+
+    def __eq__(self, other):
+        # interceptors with the same metrics are equal to share channel between clients
+        return type(self) is type(other) and self.metrics is other.metrics
+
+    def __hash__(self):
+        return hash((type(self), id(self.metrics)))
+
+    def _call_started(self, method: str):
+        self.metrics.call_started(method)
+
+    def _call_finished(self, method: str, code: grpc.StatusCode, duration: float):
+        self.metrics.call_finished(method, code, duration)
+
+    async def _response_received(self, method: str, call):
+        if await call.code() == grpc.StatusCode.OK:
+            self.metrics.message_received(method, (await call).ByteSize())
+
+    def _requests(self, method: str, request_iterator):
+        if hasattr(request_iterator, "__aiter__"):
+            return self._async_requests(method, request_iterator)
+        return self._sync_requests(method, request_iterator)
+
+    def _sync_requests(self, method: str, request_iterator):
+        for request in request_iterator:
+            self.metrics.message_sent(method, request.ByteSize())
+            yield request
+
+    async def _async_requests(self, method: str, request_iterator):
+        async for request in request_iterator:
+            self.metrics.message_sent(method, request.ByteSize())
+            yield request
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = method_name(client_call_details)
+        self.metrics.message_sent(method, request.ByteSize())
+        call = await self._intercept(continuation, client_call_details, request)
+        call.add_done_callback(lambda done: asyncio.ensure_future(self._response_received(method, done)))
+        return call
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        method = method_name(client_call_details)
+        start = time.monotonic()
+        self.metrics.message_sent(method, request.ByteSize())
+        call = await self._intercept(continuation, client_call_details, request)
+        return _observed_responses(call, ResponseObserver(self.metrics, method, start))
+
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        method = method_name(client_call_details)
+        call = await self._intercept(continuation, client_call_details, self._requests(method, request_iterator))
+        call.add_done_callback(lambda done: asyncio.ensure_future(self._response_received(method, done)))
+        return call
+
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        method = method_name(client_call_details)
+        start = time.monotonic()
+        call = await self._intercept(continuation, client_call_details, self._requests(method, request_iterator))
+        return _observed_responses(call, ResponseObserver(self.metrics, method, start))
+
+
+class RetryInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """
+    Retry failed unary calls with exponential backoff within call deadline.
+    Streaming calls aren't retried as their requests can't be replayed.
+    """
+
+    def __init__(self, policy: RetryPolicy = None):
+        """
+        Create retry interceptor.
+            :param policy: RetryPolicy, 3 attempts for UNAVAILABLE status by default
+        """
+        self.policy = RetryPolicy() if policy is None else policy
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        details = client_call_details
+        deadline = None if details.timeout is None else time.monotonic() + details.timeout
+        call = await continuation(details, request)
+        for delay in self.policy.delays():
+            if await call.code() not in self.policy.retry_codes:
+                break
+            timeout = self.policy.remaining_timeout(deadline, delay)
+            if timeout == 0:
+                break
+            await asyncio.sleep(delay)
+            call = await continuation(details._replace(timeout=timeout), request)
+        return call
@@ -0,0 +1,75 @@
+import itertools
+import threading
+
+
+class BalancedStub:
+    """
+    Stub spreading calls between stubs of several channels.
+    New call goes to channel with the least number of calls in flight, ties are broken in round-robin order.
+    """
+
+    def __init__(self, stub_class, channels: list):
+        self._stubs = [stub_class(channel) for channel in channels]
+        self._in_flight = [0] * len(self._stubs)
+        self._offsets = itertools.cycle(range(len(self._stubs)))
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = self._methods.get(name)
+        if method is None:
+            method = _BalancedMultiCallable(self, name)
+            self._methods[name] = method
+        return method
+
+    @property
+    def in_flight(self):
+        """
+        Number of calls in flight for each channel
+        """
+        return list(self._in_flight)
+
+    def _acquire(self):
+        count = len(self._stubs)
+        with self._lock:
+            offset = next(self._offsets)
+            index = min(range(count), key=lambda i: (self._in_flight[i], (i - offset) % count))
+            self._in_flight[index] += 1
+        return index
+
+    def _release(self, index: int):
+        with self._lock:
+            self._in_flight[index] -= 1
+
+
+class _BalancedMultiCallable:
+    def __init__(self, stub: BalancedStub, name: str):
+        self._stub = stub
+        self._name = name
+
+    def _invoke(self, attribute, args, kwargs):
+        index = self._stub._acquire()
+        try:
+            method = getattr(self._stub._stubs[index], self._name)
+            call = getattr(method, attribute)(*args, **kwargs) if attribute else method(*args, **kwargs)
+        except BaseException:
+            self._stub._release(index)
+            raise
+
+        if hasattr(call, "add_done_callback"):
+            # streaming and aio calls are in flight until they are done
+            call.add_done_callback(lambda _: self._stub._release(index))
+        else:
+            self._stub._release(index)
+        return call
+
+    def __call__(self, *args, **kwargs):
+        return self._invoke(None, args, kwargs)
+
+    def with_call(self, *args, **kwargs):
+        return self._invoke("with_call", args, kwargs)
+
+    def future(self, *args, **kwargs):
+        return self._invoke("future", args, kwargs)
@@ -1,15 +1,27 @@
+import threading
+import time
+
 import grpc
 
 from abc import ABC, abstractmethod
 
-from tinkoff_voicekit_client.speech_utils.config_data import MAX_LENGTH
+from tinkoff_voicekit_client.speech_utils.BaseClient.balanced_stub import BalancedStub
+from tinkoff_voicekit_client.speech_utils.BaseClient.channel_options import ChannelOptions
+from tinkoff_voicekit_client.speech_utils.BaseClient.channel_pool import ChannelPool
+from tinkoff_voicekit_client.speech_utils.BaseClient.interceptors import MetricsInterceptor
+from tinkoff_voicekit_client.speech_utils.BaseClient.tracked_channel import TrackedChannel
+from tinkoff_voicekit_client.speech_utils.metadata import MetadataPlugin
 
 
 class AbstractBaseClient(ABC):
     """
     This class provide abstract channel creation.
-    _make_channel must be overridden.
+    _make_channel and _close_later must be overridden.
+    Channels are taken from _channel_pool when shared_channel is enabled.
+    Channels count calls in flight, so they aren't closed while calls made by released client are running.
     """
+    _channel_pool: ChannelPool = None
+    _metrics_interceptor = None
 
     def __init__(
             self,
@@ -17,23 +29,122 @@ class AbstractBaseClient(ABC):
             port,
             ssl_channel=False,
             ca_file=None,
-            options: list = None,
+            options=None,
+            shared_channel: bool = True,
+            channels_count: int = 1,
+            timeout: float = None,
+            auth_plugin: bool = True,
+            interceptors: list = None,
+            metrics=None,
     ):
+        if channels_count < 1:
+            raise ValueError("channels_count must be positive")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self._timeout = timeout
+        # call credentials are supported by secure channels only
+        self._auth_plugin = auth_plugin and ssl_channel
+        self._call_credentials = None
         self._host = host
         self._port = port
         self._ssl_channel = ssl_channel
         self._ca_file = ca_file
-        self._configure_channel(options)
-        self._channel = self._make_channel()
+        self._shared_channel = shared_channel
+        interceptors = list(interceptors) if interceptors else []
+        if metrics is not None:
+            # the outermost interceptor, so latency includes retries
+            interceptors.insert(0, self._metrics_interceptor(metrics))
+        self._interceptors = tuple(interceptors)
+        self._configure_channel(options, channels_count)
+        self._channel_keys = [self._channel_key(index) for index in range(channels_count)]
+        self._channels = self._acquire_channels()
+        self._channel = self._channels[0]
+
+    def _configure_channel(self, options, channels_count=1):
+        if options is None:
+            options = ChannelOptions()
+        if isinstance(options, ChannelOptions):
+            self._options = options.to_list()
+            self._compression = options.compression
+        else:
+            # raw options override defaults, so message size limits are kept unless they are given
+            options = list(options)
+            keys = {key for key, _ in options}
+            self._options = [option for option in ChannelOptions().to_list() if option[0] not in keys] + options
+            self._compression = None
+        if channels_count > 1:
+            # separate connection for each channel instead of global subchannel
+            self._options.append(('grpc.use_local_subchannel_pool', 1))
+
+    def _channel_key(self, index: int):
+        return (
+            self._host,
+            self._port,
+            self._ssl_channel,
+            self._ca_file,
+            tuple(self._options),
+            self._compression,
+            self._interceptors,
+            index,
+        )
+
+    def _make_tracked_channel(self):
+        return TrackedChannel(self._make_channel(), self._close_later)
+
+    def _acquire_channels(self):
+        if not self._shared_channel:
+            return [self._make_tracked_channel() for _ in self._channel_keys]
+        return [self._channel_pool.acquire(key, self._make_tracked_channel) for key in self._channel_keys]
+
+    def _release_channels(self):
+        """
+        Release channels and return list of channels which must be closed when their calls are done
+        """
+        channels, self._channels = getattr(self, "_channels", []), []
+        if not channels or not self._shared_channel:
+            return channels
+        closing = []
+        for key in self._channel_keys[:len(channels)]:
+            closing.extend(self._channel_pool.release(key))
+        return closing
 
-    def _configure_channel(self, options):
-        if options:
-            self._options = options
+    def _get_timeout(self, timeout: float = None):
+        """
+        Return call timeout, client timeout is used by default
+        """
+        return self._timeout if timeout is None else timeout
+
+    def _call_options(self, metadata=None, timeout: float = None):
+        """
+        Return keyword arguments of stub call with authorization and timeout.
+        User metadata replaces client authorization.
+        """
+        if metadata:
+            return {"metadata": metadata, "timeout": self._get_timeout(timeout)}
+        if self._auth_plugin:
+            return {"credentials": self._get_call_credentials(), "timeout": self._get_timeout(timeout)}
+        return {"metadata": self._metadata.metadata, "timeout": self._get_timeout(timeout)}
+
+    def _get_call_credentials(self):
+        credentials = self._call_credentials
+        if credentials is None:
+            credentials = grpc.metadata_call_credentials(MetadataPlugin(self._metadata), name="voicekit")
+            self._call_credentials = credentials
+        return credentials
+
+    def _make_stub(self, stub_class):
+        if len(self._channels) == 1:
+            return stub_class(self._channel)
+        return BalancedStub(stub_class, self._channels)
+
+    def _prepare_metadata(self, refresh_jwt: bool):
+        metadata = getattr(self, "_metadata", None)
+        if metadata is None:
+            return
+        if refresh_jwt:
+            metadata.refresh_jwt()
         else:
-            self._options = [
-                ('grpc.max_send_message_length', MAX_LENGTH),
-                ('grpc.max_receive_message_length', MAX_LENGTH)
-            ]
+            metadata.metadata
 
     def _get_credential(self):
         if not self._ca_file:
@@ -45,22 +156,88 @@ class AbstractBaseClient(ABC):
     def _make_channel(self):
         pass
 
+    @staticmethod
+    @abstractmethod
+    def _close_later(channel):
+        """
+        Close channel from done callback of its last call
+        """
+        pass
+
+
+def _close_channel(channel: TrackedChannel):
+    if channel.close_when_idle():
+        channel.close()
+
 
 class BaseClient(AbstractBaseClient):
     """
     This class provide base methods for STT, TTS, Operations
     """
-    def __init__(self, host, port, ssl_channel=False, ca_file=None, options: list = None):
-        super().__init__(host, port, ssl_channel, ca_file, options)
+    # sync channels can be closed from timer thread of pool
+    _channel_pool = ChannelPool(close_channel=_close_channel)
+    _metrics_interceptor = MetricsInterceptor
+
+    def __init__(
+            self,
+            host,
+            port,
+            ssl_channel=False,
+            ca_file=None,
+            options=None,
+            shared_channel: bool = True,
+            channels_count: int = 1,
+            timeout: float = None,
+            auth_plugin: bool = True,
+            interceptors: list = None,
+            metrics=None,
+    ):
+        super().__init__(
+            host, port, ssl_channel, ca_file, options, shared_channel, channels_count,
+            timeout, auth_plugin, interceptors, metrics
+        )
+        for channel in self._channel_pool.pop_expired():
+            _close_channel(channel)
 
     def __del__(self):
-        if hasattr(self, "_channel"):
-            self._channel.close()
+        self.close()
+
+    def close(self):
+        """
+        Release client channels, channel is closed when no client uses it and its calls are done
+        """
+        for channel in self._release_channels():
+            _close_channel(channel)
+
+    @staticmethod
+    def _close_later(channel):
+        # done callback runs in grpc thread, so channel is closed outside of it
+        threading.Thread(target=channel.close, daemon=True).start()
+
+    def warm_up(self, timeout: float = None, refresh_jwt: bool = True):
+        """
+        Establish connections of all client channels and sign authorization token before first request.
+        Raise grpc.FutureTimeoutError if channels aren't ready in time.
+            :param timeout: max time in seconds to wait for channels, wait forever by default
+            :param refresh_jwt: sign new authorization token
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        futures = [grpc.channel_ready_future(channel) for channel in self._channels]
+        try:
+            for future in futures:
+                future.result(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+        finally:
+            for future in futures:
+                future.cancel()
+        self._prepare_metadata(refresh_jwt)
 
     def _make_channel(self):
         target = "{}:{}".format(self._host, self._port)
         if self._ssl_channel:
             creds = self._get_credential()
-            return grpc.secure_channel(target, creds, options=self._options)
+            channel = grpc.secure_channel(target, creds, options=self._options, compression=self._compression)
         else:
-            return grpc.insecure_channel(target, options=self._options)
+            channel = grpc.insecure_channel(target, options=self._options, compression=self._compression)
+        if self._interceptors:
+            channel = grpc.intercept_channel(channel, *self._interceptors)
+        return channel
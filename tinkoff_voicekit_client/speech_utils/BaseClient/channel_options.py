@@ -0,0 +1,114 @@
+import grpc
+
+from tinkoff_voicekit_client.speech_utils.config_data import MAX_LENGTH
+
+
+class ChannelOptions:
+    """
+    Typed tuning of grpc channel.
+    Parameters with None value are not passed to grpc and keep grpc defaults.
+    Presets:
+        ChannelOptions.unary_calls() - many short unary calls (recognize, operations)
+        ChannelOptions.long_streams() - long-lived streams (streaming_recognize, streaming_synthesize)
+    """
+
+    def __init__(
+            self,
+            max_send_message_length: int = MAX_LENGTH,
+            max_receive_message_length: int = MAX_LENGTH,
+            keepalive_time_ms: int = None,
+            keepalive_timeout_ms: int = None,
+            keepalive_permit_without_calls: bool = None,
+            max_pings_without_data: int = None,
+            bdp_probe: bool = None,
+            stream_window_size: int = None,
+            max_frame_size: int = None,
+            compression: grpc.Compression = None,
+            extra_options: list = None,
+    ):
+        """
+        Create grpc channel options.
+            :param max_send_message_length: max size of request message in bytes
+            :param max_receive_message_length: max size of response message in bytes
+            :param keepalive_time_ms: period of keepalive pings in milliseconds
+            :param keepalive_timeout_ms: time to wait for keepalive ping ack before closing connection
+            :param keepalive_permit_without_calls: send keepalive pings when there are no calls in flight
+            :param max_pings_without_data: max number of pings without data frames, 0 - unlimited
+            :param bdp_probe: enable HTTP/2 bandwidth-delay product probing to grow flow control windows
+            :param stream_window_size: initial HTTP/2 stream flow control window in bytes
+            :param max_frame_size: max HTTP/2 frame size in bytes
+            :param compression: channel compression, e.g. grpc.Compression.Gzip
+            :param extra_options: list of raw grpc (key, value) options added to the end
+        """
+        if compression is not None and not isinstance(compression, grpc.Compression):
+            raise ValueError("compression must be grpc.Compression, got {}".format(compression))
+        self.max_send_message_length = max_send_message_length
+        self.max_receive_message_length = max_receive_message_length
+        self.keepalive_time_ms = keepalive_time_ms
+        self.keepalive_timeout_ms = keepalive_timeout_ms
+        self.keepalive_permit_without_calls = keepalive_permit_without_calls
+        self.max_pings_without_data = max_pings_without_data
+        self.bdp_probe = bdp_probe
+        self.stream_window_size = stream_window_size
+        self.max_frame_size = max_frame_size
+        self.compression = compression
+        self.extra_options = list(extra_options) if extra_options else []
+
+    @classmethod
+    def unary_calls(cls, **kwargs):
+        """
+        Preset for many short unary calls.
+        Idle connection is kept alive between bursts of calls, BDP probing is disabled as messages are small.
+            :param kwargs: ChannelOptions parameters overriding preset
+        """
+        preset = dict(
+            keepalive_time_ms=60000,
+            keepalive_timeout_ms=20000,
+            keepalive_permit_without_calls=True,
+            bdp_probe=False,
+        )
+        preset.update(kwargs)
+        return cls(**preset)
+
+    @classmethod
+    def long_streams(cls, **kwargs):
+        """
+        Preset for long-lived streams.
+        Broken connection is detected during long stream, flow control window grows with BDP probing.
+        Server may close connection with too_many_pings if keepalive_time_ms is less than its ping policy allows.
+            :param kwargs: ChannelOptions parameters overriding preset
+        """
+        preset = dict(
+            keepalive_time_ms=20000,
+            keepalive_timeout_ms=10000,
+            keepalive_permit_without_calls=False,
+            max_pings_without_data=0,
+            bdp_probe=True,
+            stream_window_size=1024 * 1024,
+        )
+        preset.update(kwargs)
+        return cls(**preset)
+
+    def to_list(self):
+        """
+        Return list of grpc channel options
+        """
+        options = [
+            ('grpc.max_send_message_length', self.max_send_message_length),
+            ('grpc.max_receive_message_length', self.max_receive_message_length),
+            ('grpc.keepalive_time_ms', self.keepalive_time_ms),
+            ('grpc.keepalive_timeout_ms', self.keepalive_timeout_ms),
+            ('grpc.keepalive_permit_without_calls', self._flag(self.keepalive_permit_without_calls)),
+            ('grpc.http2.max_pings_without_data', self.max_pings_without_data),
+            ('grpc.http2.bdp_probe', self._flag(self.bdp_probe)),
+            ('grpc.http2.lookahead_bytes', self.stream_window_size),
+            ('grpc.http2.max_frame_size', self.max_frame_size),
+        ]
+        return [(key, value) for key, value in options if value is not None] + self.extra_options
+
+    @staticmethod
+    def _flag(value):
+        return None if value is None else int(value)
+
+    def __repr__(self):
+        return "ChannelOptions({}, compression={})".format(self.to_list(), self.compression)
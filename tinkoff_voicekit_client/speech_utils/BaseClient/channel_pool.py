@@ -0,0 +1,117 @@
+import threading
+import time
+
+from tinkoff_voicekit_client.speech_utils.config_data import CHANNEL_IDLE_TIMEOUT
+
+
+class ChannelPool:
+    """
+    Registry of grpc channels shared between clients.
+    Channels are keyed by target, credentials and options and counted by references.
+    Channel without references stays idle for idle_timeout seconds to be reused by new clients,
+    then it is returned for closing by next release or pop_expired call.
+    If close_channel is given, idle channels are also closed by timer thread when they expire.
+    """
+
+    def __init__(self, idle_timeout: float = CHANNEL_IDLE_TIMEOUT, close_channel=None):
+        """
+        Create pool.
+            :param idle_timeout: seconds to keep channel without references
+            :param close_channel: function closing channel from timer thread, no timer by default
+        """
+        self.idle_timeout = idle_timeout
+        self._close_channel = close_channel
+        self._channels = {}
+        self._idle_since = {}
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def acquire(self, key, make_channel):
+        """
+        Return channel for key, creating it if needed
+            :param key: hashable channel key
+            :param make_channel: function creating new channel
+        """
+        with self._lock:
+            entry = self._channels.get(key)
+            if entry is None:
+                entry = [make_channel(), 0]
+                self._channels[key] = entry
+            entry[1] += 1
+            self._idle_since.pop(key, None)
+            return entry[0]
+
+    def release(self, key):
+        """
+        Release channel reference and return list of channels which must be closed
+            :param key: key of acquired channel
+        """
+        with self._lock:
+            # entry is missing if it was pruned
+            entry = self._channels.get(key)
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._idle_since[key] = time.monotonic()
+                    self._schedule_sweep()
+        return self.pop_expired()
+
+    def pop_expired(self, key_filter=None):
+        """
+        Remove channels idle longer than idle_timeout and return them for closing
+            :param key_filter: function selecting keys of channels which can be closed by caller, all by default
+        """
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key, idle_since in list(self._idle_since.items()):
+                if now - idle_since >= self.idle_timeout and (key_filter is None or key_filter(key)):
+                    expired.append(self._channels.pop(key)[0])
+                    del self._idle_since[key]
+        return expired
+
+    def prune(self, is_stale):
+        """
+        Remove channels which can't be used anymore even if they are referenced and return them
+            :param is_stale: function checking channel key
+        """
+        pruned = []
+        with self._lock:
+            for key in [key for key in self._channels if is_stale(key)]:
+                pruned.append(self._channels.pop(key)[0])
+                self._idle_since.pop(key, None)
+        return pruned
+
+    def time_to_expire(self, key_filter=None):
+        """
+        Return seconds until the first idle channel expires or None if there are no idle channels
+            :param key_filter: function selecting keys of channels, all by default
+        """
+        with self._lock:
+            return self._time_to_expire(key_filter)
+
+    def _time_to_expire(self, key_filter=None):
+        idle_since = [since for key, since in self._idle_since.items() if key_filter is None or key_filter(key)]
+        if not idle_since:
+            return None
+        return max(min(idle_since) + self.idle_timeout - time.monotonic(), 0)
+
+    def _schedule_sweep(self):
+        # called under lock, timer is started for the earliest expiration
+        delay = self._time_to_expire()
+        if self._close_channel is None or self._timer is not None or delay is None:
+            return
+        self._timer = threading.Timer(delay, self._sweep)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _sweep(self):
+        with self._lock:
+            self._timer = None
+        for channel in self.pop_expired():
+            self._close_channel(channel)
+        with self._lock:
+            self._schedule_sweep()
+
+    def __len__(self):
+        return len(self._channels)
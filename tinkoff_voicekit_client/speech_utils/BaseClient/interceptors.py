@@ -0,0 +1,329 @@
+"""
+Client interceptors for sync clients, pass them to client constructor by interceptors parameter.
+Interceptors for aio clients with the same names are in aio_interceptors.
+"""
+import collections
+import random
+import threading
+import time
+
+import grpc
+
+
+class _ClientCallDetails(
+    collections.namedtuple(
+        "_ClientCallDetails",
+        ("method", "timeout", "metadata", "credentials", "wait_for_ready", "compression")
+    ),
+    grpc.ClientCallDetails
+):
+    pass
+
+
+def method_name(client_call_details):
+    """
+    Return full method name of call, e.g. /tinkoff.cloud.stt.v1.SpeechToText/Recognize
+    """
+    method = client_call_details.method
+    return method.decode("utf-8") if isinstance(method, bytes) else method
+
+
+class CallMetrics:
+    """
+    In-memory metrics of calls: calls in flight, status codes, latency and bytes per method,
+    time to first response and to first final result of streams
+    """
+
+    def __init__(self):
+        self.in_flight = collections.Counter()
+        self.codes = collections.Counter()
+        self.latency_sum = collections.Counter()
+        self.latency_count = collections.Counter()
+        self.bytes_sent = collections.Counter()
+        self.bytes_received = collections.Counter()
+        self.first_response_sum = collections.Counter()
+        self.first_response_count = collections.Counter()
+        self.final_result_sum = collections.Counter()
+        self.final_result_count = collections.Counter()
+        self._lock = threading.Lock()
+
+    def call_started(self, method: str):
+        with self._lock:
+            self.in_flight[method] += 1
+
+    def call_finished(self, method: str, code: grpc.StatusCode, duration: float):
+        with self._lock:
+            self.in_flight[method] -= 1
+            self.codes[method, code] += 1
+            self.latency_sum[method] += duration
+            self.latency_count[method] += 1
+
+    def message_sent(self, method: str, size: int):
+        with self._lock:
+            self.bytes_sent[method] += size
+
+    def message_received(self, method: str, size: int):
+        with self._lock:
+            self.bytes_received[method] += size
+
+    def first_response(self, method: str, duration: float):
+        with self._lock:
+            self.first_response_sum[method] += duration
+            self.first_response_count[method] += 1
+
+    def final_result(self, method: str, duration: float):
+        with self._lock:
+            self.final_result_sum[method] += duration
+            self.final_result_count[method] += 1
+
+
+def has_final_result(response):
+    """
+    Check if streaming response contains final recognition result
+    """
+    return any(getattr(result, "is_final", False) for result in getattr(response, "results", ()))
+
+
+class ResponseObserver:
+    """
+    Report size of streaming responses, time to first response and to first final result
+    """
+
+    def __init__(self, metrics, method: str, start: float):
+        self._metrics = metrics
+        self._method = method
+        self._start = start
+        self._first_response = True
+        self._final_result = True
+
+    def __call__(self, response):
+        self._metrics.message_received(self._method, response.ByteSize())
+        if self._first_response:
+            self._first_response = False
+            self._metrics.first_response(self._method, time.monotonic() - self._start)
+        if self._final_result and has_final_result(response):
+            self._final_result = False
+            self._metrics.final_result(self._method, time.monotonic() - self._start)
+
+
+class _ObservedResponses:
+    """
+    Response iterator of streaming call reporting responses to ResponseObserver, other attributes are taken from call
+    """
+
+    def __init__(self, call, observer: ResponseObserver):
+        self._call = call
+        self._observer = observer
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        response = next(self._call)
+        self._observer(response)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._call, name)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for retry interceptors
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            retry_codes: tuple = (grpc.StatusCode.UNAVAILABLE,),
+            initial_backoff: float = 0.1,
+            max_backoff: float = 5.0,
+            multiplier: float = 2.0,
+    ):
+        """
+        Create retry policy.
+            :param max_attempts: max number of attempts including the first one
+            :param retry_codes: status codes of failed call which is retried
+            :param initial_backoff: max delay in seconds before the first retry
+            :param max_backoff: upper limit of delay in seconds
+            :param multiplier: growth of max delay after each retry
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be positive")
+        self.max_attempts = max_attempts
+        self.retry_codes = frozenset(retry_codes)
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+
+    def delays(self):
+        """
+        Return generator of delays before retries
+        """
+        backoff = self.initial_backoff
+        for _ in range(self.max_attempts - 1):
+            yield random.uniform(0, backoff)
+            backoff = min(backoff * self.multiplier, self.max_backoff)
+
+    @staticmethod
+    def remaining_timeout(deadline, delay: float):
+        """
+        Return timeout of the next attempt or 0 if deadline is reached after delay
+        """
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic() - delay, 0)
+
+
+class _CallInterceptor(
+    grpc.UnaryUnaryClientInterceptor,
+    grpc.UnaryStreamClientInterceptor,
+    grpc.StreamUnaryClientInterceptor,
+    grpc.StreamStreamClientInterceptor
+):
+    """
+    Base interceptor observing start and end of calls of all types
+    """
+
+    def _call_started(self, method: str):
+        pass
+
+    def _call_finished(self, method: str, code: grpc.StatusCode, duration: float):
+        pass
+
+    def _intercept(self, continuation, client_call_details, request):
+        method = method_name(client_call_details)
+        start = time.monotonic()
+        self._call_started(method)
+        try:
+            call = continuation(client_call_details, request)
+        except Exception:
+            self._call_finished(method, grpc.StatusCode.UNKNOWN, time.monotonic() - start)
+            raise
+        call.add_done_callback(lambda done: self._call_finished(method, done.code(), time.monotonic() - start))
+        return call
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        return self._intercept(continuation, client_call_details, request)
+
+    def intercept_unary_stream(self, continuation, client_call_details, request):
+        return self._intercept(continuation, client_call_details, request)
+
+    def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        return self._intercept(continuation, client_call_details, request_iterator)
+
+    def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        return self._intercept(continuation, client_call_details, request_iterator)
+
+
+class TimingInterceptor(_CallInterceptor):
+    """
+    Measure latency of every call, streaming calls are measured until the end of stream
+    """
+
+    def __init__(self, callback):
+        """
+        Create timing interceptor.
+            :param callback: function called with method name, duration in seconds and status code of finished call
+        """
+        self._callback = callback
+
+    def _call_finished(self, method: str, code: grpc.StatusCode, duration: float):
+        self._callback(method, duration, code)
+
+
+class MetricsInterceptor(_CallInterceptor):
+    """
+    Collect calls in flight, status codes, latency and bytes of every call,
+    time to first response and to first final result of streams
+    """
+
+    def __init__(self, metrics=None):
+        """
+        Create metrics interceptor.
+            :param metrics: object with methods of CallMetrics, e.g. PrometheusMetrics, CallMetrics by default
+        """
+        self.metrics = CallMetrics() if metrics is None else metrics
+
+    def __eq__(self, other):
+        # interceptors with the same metrics are equal to share channel between clients
+        return type(self) is type(other) and self.metrics is other.metrics
+
+    def __hash__(self):
+        return hash((type(self), id(self.metrics)))
+
+    def _call_started(self, method: str):
+        self.metrics.call_started(method)
+
+    def _call_finished(self, method: str, code: grpc.StatusCode, duration: float):
+        self.metrics.call_finished(method, code, duration)
+
+    def _response_received(self, method: str, call):
+        if call.code() == grpc.StatusCode.OK:
+            self.metrics.message_received(method, call.result().ByteSize())
+
+    def _requests(self, method: str, request_iterator):
+        for request in request_iterator:
+            self.metrics.message_sent(method, request.ByteSize())
+            yield request
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = method_name(client_call_details)
+        self.metrics.message_sent(method, request.ByteSize())
+        call = self._intercept(continuation, client_call_details, request)
+        call.add_done_callback(lambda done: self._response_received(method, done))
+        return call
+
+    def intercept_unary_stream(self, continuation, client_call_details, request):
+        method = method_name(client_call_details)
+        start = time.monotonic()
+        self.metrics.message_sent(method, request.ByteSize())
+        call = self._intercept(continuation, client_call_details, request)
+        return _ObservedResponses(call, ResponseObserver(self.metrics, method, start))
+
+    def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        method = method_name(client_call_details)
+        call = self._intercept(continuation, client_call_details, self._requests(method, request_iterator))
+        call.add_done_callback(lambda done: self._response_received(method, done))
+        return call
+
+    def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        method = method_name(client_call_details)
+        start = time.monotonic()
+        call = self._intercept(continuation, client_call_details, self._requests(method, request_iterator))
+        return _ObservedResponses(call, ResponseObserver(self.metrics, method, start))
+
+
+class RetryInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """
+    Retry failed unary calls with exponential backoff within call deadline.
+    Streaming calls aren't retried as their requests can't be replayed.
+    """
+
+    def __init__(self, policy: RetryPolicy = None):
+        """
+        Create retry interceptor.
+            :param policy: RetryPolicy, 3 attempts for UNAVAILABLE status by default
+        """
+        self.policy = RetryPolicy() if policy is None else policy
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        details = _ClientCallDetails(
+            client_call_details.method,
+            client_call_details.timeout,
+            client_call_details.metadata,
+            client_call_details.credentials,
+            getattr(client_call_details, "wait_for_ready", None),
+            getattr(client_call_details, "compression", None),
+        )
+        deadline = None if details.timeout is None else time.monotonic() + details.timeout
+        call = continuation(details, request)
+        for delay in self.policy.delays():
+            if call.code() not in self.policy.retry_codes:
+                break
+            timeout = self.policy.remaining_timeout(deadline, delay)
+            if timeout == 0:
+                break
+            time.sleep(delay)
+            call = continuation(details._replace(timeout=timeout), request)
+        return call
@@ -0,0 +1,93 @@
+"""
+Prometheus metrics of VoiceKit calls.
+prometheus_client is optional dependency, it is imported only when PrometheusMetrics is created:
+pip install tinkoff-voicekit-client[prometheus]
+"""
+import grpc
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class PrometheusMetrics:
+    """
+    Call metrics exported to prometheus_client registry:
+        <namespace>_client_call_duration_seconds - histogram of call latency, streams are measured until their end
+        <namespace>_client_calls_in_flight - gauge of calls in flight
+        <namespace>_client_calls_total - counter of finished calls by status code
+        <namespace>_client_sent_bytes_total, <namespace>_client_received_bytes_total - size of proto messages
+        <namespace>_client_stream_first_response_seconds - histogram of time to first response of stream
+        <namespace>_client_stream_final_result_seconds - histogram of time to first final result of stream
+    All metrics are labeled by method, e.g. tinkoff.cloud.stt.v1.SpeechToText/StreamingRecognize.
+    """
+
+    def __init__(self, registry=None, namespace: str = "voicekit", buckets: tuple = LATENCY_BUCKETS):
+        """
+        Create metrics in registry.
+            :param registry: prometheus_client.CollectorRegistry, default registry of prometheus_client by default
+            :param namespace: prefix of metric names
+            :param buckets: latency histogram buckets in seconds
+        """
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError(
+                "PrometheusMetrics requires prometheus_client: pip install tinkoff-voicekit-client[prometheus]"
+            ) from None
+
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        common = dict(namespace=namespace, registry=registry)
+        self._latency = prometheus_client.Histogram(
+            "client_call_duration_seconds", "Latency of VoiceKit calls", ["method"], buckets=buckets, **common
+        )
+        self._in_flight = prometheus_client.Gauge(
+            "client_calls_in_flight", "VoiceKit calls in flight", ["method"], **common
+        )
+        self._calls = prometheus_client.Counter(
+            "client_calls", "Finished VoiceKit calls by status code", ["method", "code"], **common
+        )
+        self._sent = prometheus_client.Counter(
+            "client_sent_bytes", "Size of VoiceKit request messages", ["method"], **common
+        )
+        self._received = prometheus_client.Counter(
+            "client_received_bytes", "Size of VoiceKit response messages", ["method"], **common
+        )
+        self._first_response = prometheus_client.Histogram(
+            "client_stream_first_response_seconds",
+            "Time to first response of VoiceKit stream",
+            ["method"],
+            buckets=buckets,
+            **common
+        )
+        self._final_result = prometheus_client.Histogram(
+            "client_stream_final_result_seconds",
+            "Time to first final result of VoiceKit stream",
+            ["method"],
+            buckets=buckets,
+            **common
+        )
+
+    @staticmethod
+    def _label(method: str):
+        return method.lstrip("/")
+
+    def call_started(self, method: str):
+        self._in_flight.labels(self._label(method)).inc()
+
+    def call_finished(self, method: str, code: grpc.StatusCode, duration: float):
+        method = self._label(method)
+        self._in_flight.labels(method).dec()
+        self._calls.labels(method, code.name if code is not None else "UNKNOWN").inc()
+        self._latency.labels(method).observe(duration)
+
+    def message_sent(self, method: str, size: int):
+        self._sent.labels(self._label(method)).inc(size)
+
+    def message_received(self, method: str, size: int):
+        self._received.labels(self._label(method)).inc(size)
+
+    def first_response(self, method: str, duration: float):
+        self._first_response.labels(self._label(method)).observe(duration)
+
+    def final_result(self, method: str, duration: float):
+        self._final_result.labels(self._label(method)).observe(duration)
@@ -0,0 +1,101 @@
+import threading
+
+
+class TrackedChannel:
+    """
+    Channel wrapper counting calls in flight.
+    Calls returned to caller may outlive client which made them,
+    so channel released by all clients is closed only when its last call is done.
+    """
+
+    def __init__(self, channel, close_later):
+        """
+        Wrap channel.
+            :param channel: sync or aio grpc channel
+            :param close_later: function closing channel from done callback of its last call
+        """
+        self._channel = channel
+        self._close_later = close_later
+        self._in_flight = 0
+        self._closing = False
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._channel, name)
+
+    @property
+    def channel(self):
+        """
+        Wrapped grpc channel
+        """
+        return self._channel
+
+    @property
+    def in_flight(self):
+        """
+        Number of calls in flight
+        """
+        return self._in_flight
+
+    def unary_unary(self, *args, **kwargs):
+        return _TrackedMultiCallable(self, self._channel.unary_unary(*args, **kwargs))
+
+    def unary_stream(self, *args, **kwargs):
+        return _TrackedMultiCallable(self, self._channel.unary_stream(*args, **kwargs))
+
+    def stream_unary(self, *args, **kwargs):
+        return _TrackedMultiCallable(self, self._channel.stream_unary(*args, **kwargs))
+
+    def stream_stream(self, *args, **kwargs):
+        return _TrackedMultiCallable(self, self._channel.stream_stream(*args, **kwargs))
+
+    def close_when_idle(self):
+        """
+        Mark channel for closing, return True if it has no calls in flight and must be closed by caller,
+        otherwise channel is closed by close_later when its last call is done
+        """
+        with self._lock:
+            self._closing = True
+            return self._in_flight == 0
+
+    def _acquire(self):
+        with self._lock:
+            self._in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            close = self._closing and self._in_flight == 0
+        if close:
+            self._close_later(self._channel)
+
+
+class _TrackedMultiCallable:
+    def __init__(self, channel: TrackedChannel, multi_callable):
+        self._channel = channel
+        self._multi_callable = multi_callable
+
+    def _invoke(self, attribute, args, kwargs):
+        self._channel._acquire()
+        try:
+            method = getattr(self._multi_callable, attribute) if attribute else self._multi_callable
+            call = method(*args, **kwargs)
+        except BaseException:
+            self._channel._release()
+            raise
+
+        if hasattr(call, "add_done_callback"):
+            # streaming and aio calls are in flight until they are done
+            call.add_done_callback(lambda _: self._channel._release())
+        else:
+            self._channel._release()
+        return call
+
+    def __call__(self, *args, **kwargs):
+        return self._invoke(None, args, kwargs)
+
+    def with_call(self, *args, **kwargs):
+        return self._invoke("with_call", args, kwargs)
+
+    def future(self, *args, **kwargs):
+        return self._invoke("future", args, kwargs)
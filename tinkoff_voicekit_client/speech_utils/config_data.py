@@ -4,6 +4,11 @@ This file consider config parameters for authorization to server VoiceKit
 
 MAX_LENGTH = 32 * 10**6
 CHUNK_SIZE = 8192
+MIN_CHUNK_DURATION_MS = 20
+MAX_CHUNK_DURATION_MS = 1000
+PROTO_CACHE_SIZE = 256
+CHANNEL_IDLE_TIMEOUT = 60
+VOICES_TTL = 3600
 
 language_code = "ru-RU"
 
@@ -1,29 +1,297 @@
+import copy
+import inspect
 import io
+import json
+import mmap
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
 
-from google.protobuf.json_format import MessageToDict
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+from tinkoff_voicekit_client.speech_utils.config_data import PROTO_CACHE_SIZE
+from tinkoff_voicekit_client.speech_utils.proto_converter import message_to_dict, LazyMessageDict
+
+
+class ConfigValidator:
+    """
+    Json schema validator compiled once for schema
+    """
+    def __init__(self, schema: dict):
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        self._validator = validator_class(schema)
+
+    def validate(self, config):
+        """
+        Raise jsonschema.ValidationError like jsonschema.validate if config doesn't conform to schema.
+        PreparedConfig is already validated, it is only checked to be prepared with this validator.
+        """
+        if isinstance(config, PreparedConfig):
+            if config.validator is not self:
+                raise ValueError("Config is prepared for another method")
+            return
+        error = best_match(self._validator.iter_errors(config))
+        if error is not None:
+            raise error
+
+
+class PreparedConfig(Mapping):
+    """
+    Read-only config validated and compiled to proto message once.
+    Client methods accept it instead of config dict.
+    """
+    def __init__(self, config: dict, validator: ConfigValidator, build):
+        validator.validate(config)
+        self._config = copy.deepcopy(dict(config))
+        self.validator = validator
+        self._build = build
+        self._message = build(self._config)
+
+    def __getitem__(self, key):
+        return self._config[key]
+
+    def __iter__(self):
+        return iter(self._config)
+
+    def __len__(self):
+        return len(self._config)
+
+    def __repr__(self):
+        return f"PreparedConfig({self._config!r})"
+
+    def get_message(self, build):
+        """
+        Return proto message template, copy it before modification
+            :param build: function which message must be built by
+        """
+        if build is not self._build:
+            raise ValueError("Config is prepared for another method")
+        return self._message
+
+
+class ProtoCache:
+    """
+    Thread-safe LRU cache of proto messages built from configs.
+    Messages are templates shared between requests: copy them with CopyFrom, don't modify.
+    """
+    def __init__(self, max_size: int = PROTO_CACHE_SIZE):
+        self._max_size = max_size
+        self._messages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, config: dict, build):
+        """
+        Return cached message for config
+            :param config: config which message is built from or PreparedConfig
+            :param build: function which builds proto message from config
+        """
+        if isinstance(config, PreparedConfig):
+            return config.get_message(build)
+        key = (build, json.dumps(config, sort_keys=True, separators=(",", ":")))
+        with self._lock:
+            message = self._messages.get(key)
+            if message is not None:
+                self._messages.move_to_end(key)
+                return message
+
+        message = build(config)
+        with self._lock:
+            self._messages[key] = message
+            if len(self._messages) > self._max_size:
+                self._messages.popitem(last=False)
+        return message
+
+    def clear(self):
+        with self._lock:
+            self._messages.clear()
+
+
+proto_cache = ProtoCache()
+
+
+class MemoryAudio:
+    """
+    Read-only file-like object over bytes-like audio.
+    read returns memoryview slices, so audio isn't copied until it goes to proto.
+    """
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def __len__(self):
+        return len(self._view)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def read(self, size: int = -1):
+        start = self._position
+        if size is None or size < 0:
+            self._position = len(self._view)
+        else:
+            self._position = min(start + size, len(self._view))
+        return self._view[start:self._position]
+
+    def close(self):
+        self._view.release()
+
+
+class MappedAudio(MemoryAudio):
+    """
+    Read-only file-like object over memory-mapped audio file.
+    File stays mapped after close while slices returned by read are alive.
+    """
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        super().__init__(self._mmap)
+
+    def close(self):
+        super().close()
+        mapping, self._mmap = self._mmap, None
+        if mapping is None:
+            return
+        try:
+            mapping.close()
+        except BufferError:
+            # slices returned by read are alive, file is unmapped when they are released
+            pass
+
+
+class ReadIntoAudio:
+    """
+    File-like adapter for objects which provide only readinto
+    """
+    def __init__(self, source):
+        self._source = source
+
+    def read(self, size: int = -1):
+        if size is None or size < 0:
+            chunks = []
+            data = self.read(io.DEFAULT_BUFFER_SIZE)
+            while data:
+                chunks.append(data)
+                data = self.read(io.DEFAULT_BUFFER_SIZE)
+            return b"".join(chunks)
+        buffer = bytearray(size)
+        length = self._source.readinto(buffer)
+        return memoryview(buffer)[:length or 0]
+
+
+class AsyncIterableAudio:
+    """
+    Async file-like adapter for async iterables with audio chunks
+    """
+    def __init__(self, source):
+        self._iterator = source.__aiter__()
+        self._pending = b""
+        self._exhausted = False
+
+    async def read(self, size: int = -1):
+        chunks = [self._pending] if self._pending else []
+        length = len(self._pending)
+        while not self._exhausted and (size is None or size < 0 or length < size):
+            try:
+                data = await self._iterator.__anext__()
+            except StopAsyncIteration:
+                self._exhausted = True
+                break
+            chunks.append(data)
+            length += len(data)
+
+        if size is None or size < 0 or length <= size:
+            self._pending = b""
+            return b"".join(chunks)
+        # only the last chunk overflows size, its rest is kept as view to not copy it on every read
+        last = memoryview(chunks[-1]).cast("B")
+        split = len(last) - (length - size)
+        self._pending = last[split:]
+        chunks[-1] = last[:split]
+        return b"".join(chunks)
 
 
 def get_buffer(source):
-    if type(source) is str and os.path.isfile(source):
-        with open(source, "rb") as f:
-            buffer = f.read()
-        return io.BytesIO(buffer)
-    elif isinstance(source, io.BufferedReader):
-        return source
-    elif isinstance(source, io.BytesIO):
+    """
+    Return file-like object for audio source
+        :param source: path to file (str or os.PathLike), bytes-like object,
+            or file-like object with read or readinto
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.isfile(source):
+            raise ValueError(f"Incorrect source parameters: file {source} doesn't exist")
+        if os.path.getsize(source) == 0:
+            return io.BytesIO()
+        return MappedAudio(os.fspath(source))
+    elif hasattr(source, "read"):
         return source
-    else:
-        raise ValueError("Incorrect source parameters: must be path to file or io.BufferedReader")
+    elif hasattr(source, "readinto"):
+        return ReadIntoAudio(source)
 
+    try:
+        return MemoryAudio(source)
+    except TypeError:
+        raise ValueError(
+            "Incorrect source parameters: must be path to file, bytes-like object or file-like object"
+        ) from None
 
-def response_format(response, dict_format, response_metadata=None):
+
+def aio_get_buffer(source):
+    """
+    Return file-like object for audio source, read may be coroutine
+        :param source: async iterable with audio chunks, async readable or one of get_buffer sources
+    """
+    if not hasattr(source, "read") and hasattr(source, "__aiter__"):
+        return AsyncIterableAudio(source)
+    return get_buffer(source)
+
+
+def close_buffer(buffer):
+    """
+    Close buffer made by get_buffer, aio_get_buffer or aio_read_all, if it can be closed
+    """
+    close = getattr(buffer, "close", None)
+    if close is not None:
+        close()
+
+
+async def aio_read(buffer, size: int = -1):
+    data = buffer.read(size)
+    if inspect.isawaitable(data):
+        data = await data
+    return data
+
+
+async def aio_read_all(buffer):
+    """
+    Read whole audio from buffer to MemoryAudio
+    """
+    if isinstance(buffer, MemoryAudio):
+        return buffer
+    return MemoryAudio(await aio_read(buffer))
+
+
+def get_dict_converter(dict_format):
+    """
+    Return response converter for dict_format or None for proto responses
+        :param dict_format: True for dict, "lazy" for LazyMessageDict, False for proto
+    """
+    if dict_format == "lazy":
+        return LazyMessageDict
     if dict_format:
-        _response = MessageToDict(
-            response,
-            including_default_value_fields=True,
-            preserving_proto_field_name=True
-        )
+        return message_to_dict
+    return None
+
+
+def response_format(response, dict_format, response_metadata=None):
+    converter = get_dict_converter(dict_format)
+    if converter:
+        _response = converter(response)
     else:
         _response = response
 
@@ -33,26 +301,20 @@ def response_format(response, dict_format, response_metadata=None):
 
 
 def dict_generator(responses, dict_format):
-    if dict_format:
+    converter = get_dict_converter(dict_format)
+    if converter:
         for response in responses:
-            yield MessageToDict(
-                response,
-                including_default_value_fields=True,
-                preserving_proto_field_name=True
-            )
+            yield converter(response)
     else:
         for response in responses:
             yield response
 
 
 async def aio_dict_generator(responses, dict_format):
-    if dict_format:
+    converter = get_dict_converter(dict_format)
+    if converter:
         async for response in responses:
-            yield MessageToDict(
-                response,
-                including_default_value_fields=True,
-                preserving_proto_field_name=True
-            )
+            yield converter(response)
     else:
         async for response in responses:
             yield response
@@ -1,12 +1,21 @@
-import copy
 from time import time
 import hmac
 import json
 import base64
+import threading
 
+import grpc
 
-class Metadata:
+
+class TokenCache:
+    """
+    Process-wide thread-safe cache of signed tokens.
+    Clients with the same api key, secret key and audience share one token and one immutable metadata tuple.
+    Token is signed again ahead of expiry, after _REFRESH_RATIO of its lifetime,
+    so calls never carry token which is about to expire.
+    """
     _TEN_MINUTES = 600
+    _REFRESH_RATIO = 0.8
 
     _AUTH_PAYLOAD = {
         "iss": "best_issuer",
@@ -20,26 +29,49 @@ class Metadata:
         "kid": None
     }
 
-    def __init__(self, api_key: str, secret_key: str, aud: str):
-        self._aud = aud
-        self._api_key = api_key
-        self._secret_key = secret_key
-        jwt = self._create_jwt(api_key, secret_key)
-        metadata = [
-            ["authorization", "Bearer {0}".format(jwt)],
-            ["x-api-key", api_key],
-        ]
+    def __init__(self):
+        self._tokens = {}
+        self._lock = threading.Lock()
 
-        self._metadata = metadata
+    def get(self, api_key: str, secret_key: str, aud: str, refresh: bool = False):
+        """
+        Return (metadata, refresh_time, expiration_time) of token, sign new token if needed
+            :param api_key: client public api key
+            :param secret_key: client secret api key
+            :param aud: token audience
+            :param refresh: sign new token even if cached one is fresh
+        """
+        key = (api_key, secret_key, aud)
+        token = self._tokens.get(key)
+        if token is not None and not refresh and time() < token[1]:
+            return token
+        with self._lock:
+            current = self._tokens.get(key)
+            # token could be signed by another thread while waiting for lock
+            if current is None or current is token or time() >= current[1]:
+                current = self._sign(api_key, secret_key, aud)
+                self._tokens[key] = current
+            return current
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
 
-    def _create_jwt(self, api_key: str, secret_key: str):
-        header = copy.deepcopy(Metadata._HEADER)
-        header["kid"] = api_key
+    @classmethod
+    def _sign(cls, api_key: str, secret_key: str, aud: str):
+        now = int(time())
+        expiration_time = now + cls._TEN_MINUTES
+        jwt = cls._create_jwt(api_key, secret_key, aud, expiration_time)
+        metadata = (
+            ("authorization", "Bearer {0}".format(jwt)),
+            ("x-api-key", api_key),
+        )
+        return metadata, now + cls._TEN_MINUTES * cls._REFRESH_RATIO, expiration_time
 
-        auth_payload = copy.deepcopy(Metadata._AUTH_PAYLOAD)
-        auth_payload["aud"] = self._aud
-        self._expiration_time = int(time()) + Metadata._TEN_MINUTES
-        auth_payload["exp"] = self._expiration_time
+    @classmethod
+    def _create_jwt(cls, api_key: str, secret_key: str, aud: str, expiration_time: int):
+        header = dict(cls._HEADER, kid=api_key)
+        auth_payload = dict(cls._AUTH_PAYLOAD, aud=aud, exp=expiration_time)
 
         payload_bytes = json.dumps(auth_payload, separators=(',', ':')).encode("utf-8")
         header_bytes = json.dumps(header, separators=(',', ':')).encode("utf-8")
@@ -47,7 +79,7 @@ class Metadata:
         header_base64 = base64.urlsafe_b64encode(header_bytes)
 
         data = header_base64 + b"." + payload_base64
-        signature_bytes = hmac.new(base64.urlsafe_b64decode(self._pad_base64(secret_key)),
+        signature_bytes = hmac.new(base64.urlsafe_b64decode(cls._pad_base64(secret_key)),
                                    msg=data,
                                    digestmod="sha256")
         signature = base64.urlsafe_b64encode(signature_bytes.digest())
@@ -55,19 +87,57 @@ class Metadata:
         jwt = data + b"." + signature
         return jwt.decode("utf-8")
 
-    def _pad_base64(self, base64_str):
+    @staticmethod
+    def _pad_base64(base64_str):
         num_equals_signs = 4 - len(base64_str) % 4
         return base64_str + '=' * num_equals_signs
 
+
+token_cache = TokenCache()
+
+
+class Metadata:
+    """
+    Authorization metadata for VoiceKit calls, signed tokens are taken from process-wide token_cache
+    """
+    _TEN_MINUTES = TokenCache._TEN_MINUTES
+    _REFRESH_RATIO = TokenCache._REFRESH_RATIO
+
+    def __init__(self, api_key: str, secret_key: str, aud: str):
+        self._aud = aud
+        self._api_key = api_key
+        self._secret_key = secret_key
+        self._token = token_cache.get(api_key, secret_key, aud)
+
     def is_fresh_jwt(self):
-        return self._expiration_time > int(time())
+        return self._token[2] > int(time())
 
     def refresh_jwt(self):
-        api_key = self._metadata[1][1]
-        self._metadata[0][1] = "Bearer {0}".format(self._create_jwt(api_key, self._secret_key))
+        """
+        Sign new token, calls in flight keep the previous metadata tuple
+        """
+        self._token = token_cache.get(self._api_key, self._secret_key, self._aud, refresh=True)
 
     @property
     def metadata(self):
-        if not self.is_fresh_jwt():
-            self.refresh_jwt()
-        return self._metadata
+        token = self._token
+        if time() >= token[1]:
+            token = self._token = token_cache.get(self._api_key, self._secret_key, self._aud)
+        return token[0]
+
+
+class MetadataPlugin(grpc.AuthMetadataPlugin):
+    """
+    Authorization plugin attaching Metadata by grpc call credentials
+    """
+
+    def __init__(self, metadata: Metadata):
+        self._metadata = metadata
+
+    def __call__(self, context, callback):
+        try:
+            metadata = self._metadata.metadata
+        except Exception as error:
+            callback((), error)
+        else:
+            callback(metadata, None)
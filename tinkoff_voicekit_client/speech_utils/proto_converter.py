@@ -0,0 +1,326 @@
+"""
+Fast conversion of VoiceKit responses to dict.
+Converters are compiled once per message descriptor and produce the same dict as
+MessageToDict(message, including_default_value_fields=True, preserving_proto_field_name=True).
+LazyMessageDict provides the same dict as read-only view converting fields on access.
+"""
+import base64
+import inspect
+import keyword
+import math
+import threading
+from collections.abc import Mapping, Sequence
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.json_format import MessageToDict
+
+try:
+    from google.protobuf.internal.type_checkers import ToShortestFloat
+except ImportError:
+    ToShortestFloat = float
+
+if "including_default_value_fields" in inspect.signature(MessageToDict).parameters:
+    _DEFAULT_VALUE_FIELDS = {"including_default_value_fields": True}
+else:
+    _DEFAULT_VALUE_FIELDS = {"always_print_fields_with_no_presence": True}
+
+_INT64_TYPES = (
+    FieldDescriptor.TYPE_INT64,
+    FieldDescriptor.TYPE_UINT64,
+    FieldDescriptor.TYPE_FIXED64,
+    FieldDescriptor.TYPE_SFIXED64,
+    FieldDescriptor.TYPE_SINT64,
+)
+
+_JSON_STRING_TYPES = (
+    "google.protobuf.Timestamp",
+    "google.protobuf.FieldMask",
+)
+
+_GENERIC_TYPES = (
+    "google.protobuf.Any",
+    "google.protobuf.Struct",
+    "google.protobuf.Value",
+    "google.protobuf.ListValue",
+)
+
+_SPECIAL_TYPES = ("google.protobuf.Duration",) + _JSON_STRING_TYPES + _GENERIC_TYPES
+
+_converters = {}
+_compiling_converters = {}
+_converters_lock = threading.RLock()
+_lazy_fields = {}
+
+
+def proto_message_to_dict(message):
+    """
+    Generic MessageToDict conversion with default value fields and proto field names
+    """
+    return MessageToDict(message, preserving_proto_field_name=True, **_DEFAULT_VALUE_FIELDS)
+
+
+def _float_to_json(value):
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return value
+
+
+def _duration_to_json(message):
+    """
+    Format Duration like Duration.ToJsonString without its validation overhead
+    """
+    seconds, nanos = message.seconds, message.nanos
+    sign = ""
+    if seconds < 0 or nanos < 0:
+        sign, seconds, nanos = "-", -seconds, -nanos
+    if nanos == 0:
+        return f"{sign}{seconds}s"
+    if nanos % 1000000 == 0:
+        return f"{sign}{seconds}.{nanos // 1000000:03d}s"
+    if nanos % 1000 == 0:
+        return f"{sign}{seconds}.{nanos // 1000:06d}s"
+    return f"{sign}{seconds}.{nanos:09d}s"
+
+
+def _is_repeated(field):
+    is_repeated = getattr(field, "is_repeated", None)
+    if is_repeated is not None:
+        return is_repeated
+    return field.label == FieldDescriptor.LABEL_REPEATED
+
+
+def _has_presence(field):
+    has_presence = getattr(field, "has_presence", None)
+    if has_presence is not None:
+        return has_presence
+    return field.message_type is not None or field.containing_oneof is not None
+
+
+def _get_value_converter(field):
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        return get_converter(field.message_type)
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        values = {number: value.name for number, value in field.enum_type.values_by_number.items()}
+        return lambda value: values.get(value, value)
+    if field.type in _INT64_TYPES:
+        return str
+    if field.type == FieldDescriptor.TYPE_BYTES:
+        return lambda value: base64.b64encode(value).decode("utf-8")
+    if field.type == FieldDescriptor.TYPE_FLOAT:
+        return lambda value: _float_to_json(ToShortestFloat(value))
+    if field.type == FieldDescriptor.TYPE_DOUBLE:
+        return _float_to_json
+    return None
+
+
+def _get_map_key_converter(field):
+    if field.type == FieldDescriptor.TYPE_BOOL:
+        return lambda key: "true" if key else "false"
+    return str
+
+
+def _compile_converter(descriptor):
+    """
+    Generate source of converter function for descriptor and compile it
+    """
+    if descriptor.full_name == "google.protobuf.Duration":
+        return _duration_to_json
+    if descriptor.full_name in _JSON_STRING_TYPES:
+        return lambda message: message.ToJsonString()
+    if descriptor.full_name in _GENERIC_TYPES:
+        return proto_message_to_dict
+
+    namespace = {}
+    lines = ["def convert(message):", "    result = {}"]
+    for index, field in enumerate(descriptor.fields):
+        name = field.name
+        value = f"message.{name}" if not keyword.iskeyword(name) else f"getattr(message, {name!r})"
+        converter = f"convert_{index}"
+        if field.message_type is not None and field.message_type.GetOptions().map_entry:
+            namespace[f"convert_key_{index}"] = _get_map_key_converter(field.message_type.fields_by_name["key"])
+            value_converter = _get_value_converter(field.message_type.fields_by_name["value"])
+            item = "item"
+            if value_converter is not None:
+                namespace[converter] = value_converter
+                item = f"{converter}(item)"
+            lines.append(
+                f"    result[{name!r}] = {{convert_key_{index}(key): {item} for key, item in {value}.items()}}"
+            )
+            continue
+
+        value_converter = _get_value_converter(field)
+        if value_converter is not None:
+            namespace[converter] = value_converter
+        if _is_repeated(field):
+            item = "item" if value_converter is None else f"{converter}(item)"
+            lines.append(f"    result[{name!r}] = [{item} for item in {value}]")
+        else:
+            item = value if value_converter is None else f"{converter}({value})"
+            if _has_presence(field):
+                lines.append(f"    if message.HasField({name!r}):")
+                lines.append(f"        result[{name!r}] = {item}")
+            else:
+                lines.append(f"    result[{name!r}] = {item}")
+    lines.append("    return result")
+
+    exec(compile("\n".join(lines), f"<converter {descriptor.full_name}>", "exec"), namespace)
+    return namespace["convert"]
+
+
+class _RecursiveConverter:
+    """
+    Placeholder for converter which is being compiled, used by recursive message types
+    """
+    def __init__(self, descriptor):
+        self._descriptor = descriptor
+
+    def __call__(self, message):
+        return _converters[self._descriptor.full_name](message)
+
+
+def get_converter(descriptor):
+    """
+    Return function converting messages of descriptor type to dict
+        :param descriptor: proto message descriptor
+    """
+    converter = _converters.get(descriptor.full_name)
+    if converter is not None:
+        return converter
+    with _converters_lock:
+        converter = _converters.get(descriptor.full_name) or _compiling_converters.get(descriptor.full_name)
+        if converter is None:
+            _compiling_converters[descriptor.full_name] = _RecursiveConverter(descriptor)
+            try:
+                converter = _compile_converter(descriptor)
+            finally:
+                _compiling_converters.pop(descriptor.full_name)
+            _converters[descriptor.full_name] = converter
+    return converter
+
+
+def message_to_dict(message):
+    """
+    Convert proto message to dict like MessageToDict with default value fields and proto field names
+        :param message: proto message
+    """
+    return get_converter(message.DESCRIPTOR)(message)
+
+
+def _get_lazy_value_converter(field):
+    if field.type == FieldDescriptor.TYPE_MESSAGE and field.message_type.full_name not in _SPECIAL_TYPES:
+        return LazyMessageDict
+    return _get_value_converter(field)
+
+
+def _get_lazy_fields(descriptor):
+    fields = _lazy_fields.get(descriptor.full_name)
+    if fields is not None:
+        return fields
+
+    fields = {}
+    for field in descriptor.fields:
+        if field.message_type is not None and field.message_type.GetOptions().map_entry:
+            key_converter = _get_map_key_converter(field.message_type.fields_by_name["key"])
+            value_converter = _get_lazy_value_converter(field.message_type.fields_by_name["value"])
+            fields[field.name] = ("map", (key_converter, value_converter))
+        elif _is_repeated(field):
+            fields[field.name] = ("repeated", _get_lazy_value_converter(field))
+        elif _has_presence(field):
+            fields[field.name] = ("optional", _get_lazy_value_converter(field))
+        else:
+            fields[field.name] = ("scalar", _get_lazy_value_converter(field))
+    _lazy_fields[descriptor.full_name] = fields
+    return fields
+
+
+class LazyMessageDict(Mapping):
+    """
+    Read-only dict view of proto message, fields are converted on first access.
+    Keys and values are the same as in message_to_dict result.
+    """
+    __slots__ = ("_message", "_fields", "_values")
+
+    def __init__(self, message):
+        self._message = message
+        self._fields = _get_lazy_fields(message.DESCRIPTOR)
+        self._values = {}
+
+    @property
+    def message(self):
+        return self._message
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+
+        kind, converter = self._fields[key]
+        if kind == "optional" and not self._message.HasField(key):
+            raise KeyError(key)
+        value = getattr(self._message, key)
+        if kind == "repeated":
+            value = LazyList(value, converter)
+        elif kind == "map":
+            key_converter, value_converter = converter
+            value = {
+                key_converter(item_key): item if value_converter is None else value_converter(item)
+                for item_key, item in value.items()
+            }
+        elif converter is not None:
+            value = converter(value)
+        self._values[key] = value
+        return value
+
+    def __iter__(self):
+        for name, (kind, _) in self._fields.items():
+            if kind != "optional" or self._message.HasField(name):
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"LazyMessageDict({self.to_dict()!r})"
+
+    def to_dict(self):
+        """
+        Convert whole message to dict
+        """
+        return message_to_dict(self._message)
+
+
+class LazyList(Sequence):
+    """
+    Read-only list view of repeated proto field, items are converted on first access
+    """
+    __slots__ = ("_values", "_converter", "_items")
+
+    def __init__(self, values, converter=None):
+        self._values = values
+        self._converter = converter
+        self._items = {}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._values)))]
+        if index < 0:
+            index += len(self._values)
+        if index in self._items:
+            return self._items[index]
+        value = self._values[index]
+        if self._converter is not None:
+            value = self._converter(value)
+        self._items[index] = value
+        return value
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"LazyList({list(self)!r})"